@@ -17,6 +17,8 @@ from .interfaces.atlas_client import (
     atlas_enhance, 
     atlas_status,
     atlas_health,
+    get_session,
+    close_session,
     AtlasClient,
     AtlasError
 )
@@ -40,6 +42,8 @@ __all__ = [
     'atlas_enhance',
     'atlas_status', 
     'atlas_health',
+    'get_session',
+    'close_session',
     'AtlasClient',
     'AtlasError',
     
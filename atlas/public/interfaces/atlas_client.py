@@ -4,42 +4,107 @@ Provides public API functions for ATLAS black-box system.
 ONLY contains public interfaces - internal implementation is opaque.
 """
 
-from typing import Dict, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional
 import asyncio
-import aiohttp
+import httpx
 import logging
+import weakref
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_BASE_URL = "http://localhost:8004"
+DEFAULT_TIMEOUT = 30
+
+# Shared read-only stand-in for omitted options/parameters (no per-call dict)
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+# Shared HTTP sessions, one per event loop: an httpx client is bound to the
+# loop it first runs on, so a client cached across asyncio.run() calls would
+# fail once its loop is closed. Entries go away with their loop.
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+def _new_client(base_url: str, timeout: float) -> httpx.AsyncClient:
+    """Create a pooled keep-alive ATLAS HTTP client."""
+    return httpx.AsyncClient(
+        base_url=base_url,
+        timeout=timeout,
+        limits=httpx.Limits(
+            max_connections=200,
+            max_keepalive_connections=100,
+            keepalive_expiry=75
+        )
+    )
+
+
+async def get_session() -> httpx.AsyncClient:
+    """
+    Return the shared ATLAS client session for the running event loop,
+    creating it on first use.
+    
+    Reusing one session avoids a new TCP connection pool (and handshake)
+    per call.
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    # No await between the check and the store, so concurrent callers on
+    # the same loop cannot both create a client - no lock needed
+    if session is None or session.is_closed:
+        session = _sessions[loop] = _new_client(DEFAULT_BASE_URL, DEFAULT_TIMEOUT)
+    return session
+
+
+async def close_session() -> None:
+    """Close the running loop's shared ATLAS client session (call on application shutdown)."""
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.is_closed:
+        await session.aclose()
+
 
 class AtlasClient:
     """
     ATLAS public interface client.
     All internal implementation details are completely opaque.
+    
+    With the default base_url and timeout this is a thin facade over the
+    shared module session - entering the context does not open a new
+    connection pool and exiting does not close it. Any other base_url or
+    timeout gets its own client, closed on exit.
+    
+    Inside the context, ``_session`` is an ``httpx.AsyncClient`` whose
+    base_url is already set: call ``await client._session.post(path, ...)``
+    with a relative path (it is no longer an aiohttp session, so
+    ``async with client._session.post(...)`` does not work).
     """
     
-    def __init__(self, base_url: str = "http://localhost:8004", timeout: int = 30):
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, timeout: int = DEFAULT_TIMEOUT):
         self.base_url = base_url
         self.timeout = timeout
-        self._session = None
+        self._session: Optional[httpx.AsyncClient] = None
+        self._owns_session = False
     
     async def __aenter__(self):
         """Async context manager entry."""
-        self._session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=self.timeout)
-        )
+        if self.base_url == DEFAULT_BASE_URL and self.timeout == DEFAULT_TIMEOUT:
+            self._session = await get_session()
+        else:
+            self._session = _new_client(self.base_url, self.timeout)
+            self._owns_session = True
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        """Async context manager exit."""
-        if self._session:
-            await self._session.close()
+        """Async context manager exit (the shared session stays open)."""
+        if self._owns_session and self._session is not None:
+            await self._session.aclose()
+        self._session = None
+        self._owns_session = False
 
 
 async def atlas_process(
     input_data: str,
     mode: str = "default",
-    options: Optional[Dict[str, Any]] = None
+    options: Optional[Mapping[str, Any]] = None
 ) -> Dict[str, Any]:
     """
     Process content through ATLAS black-box system.
@@ -55,30 +120,27 @@ async def atlas_process(
     Note:
         Internal processing is completely opaque - only public interface documented.
     """
-    if options is None:
-        options = {}
+    options = options or _EMPTY
     
-    async with AtlasClient() as client:
-        payload = {
-            "input": input_data,
-            "mode": mode,
-            "options": options
-        }
-        
-        async with client._session.post(
-            f"{client.base_url}/atlas/v1/process",
-            json=payload
-        ) as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                raise AtlasError(f"ATLAS processing failed: {response.status}")
+    session = await get_session()
+    payload = {
+        "input": input_data,
+        "mode": mode,
+        # JSON encoders only accept real dicts; other mappings are copied
+        "options": options if type(options) is dict else dict(options)
+    }
+    
+    response = await session.post("/atlas/v1/process", json=payload)
+    if response.status_code == 200:
+        return response.json()
+    else:
+        raise AtlasError(f"ATLAS processing failed: {response.status_code}")
 
 
 async def atlas_enhance(
     content: str,
     enhancement_type: str = "quality",
-    parameters: Optional[Dict[str, Any]] = None
+    parameters: Optional[Mapping[str, Any]] = None
 ) -> str:
     """
     Enhance content quality through ATLAS.
@@ -94,15 +156,12 @@ async def atlas_enhance(
     Note:
         Enhancement algorithms are black-box - implementation not documented.
     """
-    if parameters is None:
-        parameters = {}
-    
     result = await atlas_process(
         input_data=content,
         mode="enhance",
         options={
             "enhancement_type": enhancement_type,
-            **parameters
+            **(parameters or _EMPTY)
         }
     )
     
@@ -119,14 +178,12 @@ async def atlas_status() -> Dict[str, Any]:
     Note:
         Only public status exposed - internal metrics are opaque.
     """
-    async with AtlasClient() as client:
-        async with client._session.get(
-            f"{client.base_url}/atlas/v1/status"
-        ) as response:
-            if response.status == 200:
-                return await response.json()
-            else:
-                raise AtlasError(f"ATLAS status check failed: {response.status}")
+    session = await get_session()
+    response = await session.get("/atlas/v1/status")
+    if response.status_code == 200:
+        return response.json()
+    else:
+        raise AtlasError(f"ATLAS status check failed: {response.status_code}")
 
 
 async def atlas_health() -> bool:
@@ -137,11 +194,9 @@ async def atlas_health() -> bool:
         True if ATLAS is healthy, False otherwise
     """
     try:
-        async with AtlasClient() as client:
-            async with client._session.get(
-                f"{client.base_url}/atlas/health"
-            ) as response:
-                return response.status == 200
+        session = await get_session()
+        response = await session.get("/atlas/health")
+        return response.status_code == 200
     except Exception:
         return False
 
@@ -158,5 +213,7 @@ __all__ = [
     'atlas_enhance',
     'atlas_status',
     'atlas_health',
+    'get_session',
+    'close_session',
     'AtlasError'
 ]
\ No newline at end of file
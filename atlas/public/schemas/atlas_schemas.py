@@ -30,12 +30,6 @@ class AtlasProcessRequest(BaseModel):
     input: str = Field(..., description="Content to process")
     mode: ProcessingMode = Field(default=ProcessingMode.DEFAULT, description="Processing mode")
     options: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Processing options")
-    
-    class Config:
-        json_encoders = {
-            ProcessingMode: lambda v: v.value,
-            EnhancementType: lambda v: v.value
-        }
 
 
 class AtlasProcessResponse(BaseModel):
@@ -53,11 +47,6 @@ class AtlasEnhanceRequest(BaseModel):
     content: str = Field(..., description="Content to enhance")
     enhancement_type: EnhancementType = Field(default=EnhancementType.QUALITY, description="Enhancement type")
     parameters: Optional[Dict[str, Any]] = Field(default_factory=dict, description="Enhancement parameters")
-    
-    class Config:
-        json_encoders = {
-            EnhancementType: lambda v: v.value
-        }
 
 
 class AtlasEnhanceResponse(BaseModel):
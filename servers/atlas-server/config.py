@@ -6,25 +6,34 @@ IMPORTANT: Only public configuration is loaded and documented.
 Internal ATLAS core configuration is completely opaque.
 """
 
+import functools
 import yaml
 from pathlib import Path
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Dict, Any, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class AtlasServerConfig(BaseModel):
+class AtlasBaseConfig(BaseModel):
+    """Base class for static ATLAS configuration sections."""
+    
+    # Immutable after load (safe to share the cached instance), unknown keys ignored
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
+
+class AtlasServerConfig(AtlasBaseConfig):
     """ATLAS server configuration - public parameters only."""
     host: str = Field(default="0.0.0.0", description="Server host")
     port: int = Field(default=8004, description="Server port") 
-    workers: int = Field(default=1, description="Worker processes")
+    workers: int = Field(default=0, description="Worker processes (0 = one per CPU core)")
     reload: bool = Field(default=False, description="Auto-reload (disabled for black-box)")
+    debug: bool = Field(default=False, description="Debug mode (simulates internal processing latency)")
     log_level: str = Field(default="WARNING", description="Log level")
 
 
-class AtlasApiConfig(BaseModel):
+class AtlasApiConfig(AtlasBaseConfig):
     """ATLAS API configuration - public interface settings."""
     version: str = Field(default="v1", description="API version")
     base_path: str = Field(default="/atlas", description="Base API path")
@@ -34,14 +43,14 @@ class AtlasApiConfig(BaseModel):
     request_timeout_seconds: int = Field(default=30, description="Request timeout")
 
 
-class AtlasRateLimitConfig(BaseModel):
+class AtlasRateLimitConfig(AtlasBaseConfig):
     """Rate limiting configuration."""
     enabled: bool = Field(default=True, description="Rate limiting enabled")
     requests_per_minute: int = Field(default=100, description="Requests per minute")
     burst_limit: int = Field(default=20, description="Burst limit")
 
 
-class AtlasSecurityConfig(BaseModel):
+class AtlasSecurityConfig(AtlasBaseConfig):
     """Security configuration - public parameters only."""
     cors_enabled: bool = Field(default=True, description="CORS enabled")
     cors_origins: List[str] = Field(default=["*"], description="CORS origins")
@@ -49,7 +58,7 @@ class AtlasSecurityConfig(BaseModel):
     https_only: bool = Field(default=False, description="HTTPS only")
 
 
-class AtlasMonitoringConfig(BaseModel):
+class AtlasMonitoringConfig(AtlasBaseConfig):
     """Monitoring configuration - public metrics only."""
     metrics_enabled: bool = Field(default=True, description="Metrics enabled")
     metrics_port: int = Field(default=9004, description="Metrics port")
@@ -57,14 +66,14 @@ class AtlasMonitoringConfig(BaseModel):
     health_check_interval: int = Field(default=30, description="Health check interval")
 
 
-class AtlasIntegrationConfig(BaseModel):
+class AtlasIntegrationConfig(AtlasBaseConfig):
     """Integration settings with other services."""
     memory_server_url: str = Field(default="http://localhost:8001", description="Memory Server URL")
     llm_server_url: str = Field(default="http://localhost:8002", description="LLM Server URL") 
     gui_server_url: str = Field(default="http://localhost:8003", description="GUI Server URL")
 
 
-class AtlasConfig(BaseModel):
+class AtlasConfig(AtlasBaseConfig):
     """
     Complete ATLAS configuration.
     
@@ -98,10 +107,14 @@ class AtlasConfig(BaseModel):
     )
 
 
+@functools.lru_cache(maxsize=4)
 def load_atlas_config(config_path: Optional[str] = None) -> AtlasConfig:
     """
     Load ATLAS configuration from YAML file.
     
+    Results are cached per path; call load_atlas_config.cache_clear()
+    to force a re-read.
+    
     Args:
         config_path: Path to configuration file
         
@@ -124,7 +137,7 @@ def load_atlas_config(config_path: Optional[str] = None) -> AtlasConfig:
         return AtlasConfig(**atlas_data)
         
     except Exception as e:
-        logger.warning(f"Failed to load ATLAS config from {config_path}: {e}")
+        logger.warning("Failed to load ATLAS config from %s: %s", config_path, e)
         logger.info("Using default ATLAS configuration")
         return AtlasConfig()
 
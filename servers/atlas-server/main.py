@@ -8,16 +8,25 @@ Only documented public endpoints are accessible.
 """
 
 import asyncio
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+import contextvars
+import itertools
 import logging
+import os
 from pathlib import Path
 import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+import httpx
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
+import orjson
 import uvicorn
 from datetime import datetime
 import time
@@ -31,47 +40,213 @@ from atlas.public.schemas.atlas_schemas import (
     AtlasHealthResponse,
     AtlasErrorResponse
 )
+from atlas.public.interfaces.atlas_client import get_session, close_session
+from config import atlas_config
+
+# Optional accelerated event loop and HTTP parser
+try:
+    import uvloop  # noqa: F401
+    EVENT_LOOP = "uvloop"
+except ImportError:
+    EVENT_LOOP = "asyncio"
+
+try:
+    import httptools  # noqa: F401
+    HTTP_PROTOCOL = "httptools"
+except ImportError:
+    HTTP_PROTOCOL = "h11"
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Request batching for /atlas/v1/process
+BATCH_MAX_SIZE = 32
+BATCH_MAX_WAIT_SECONDS = 0.005
+
+_process_queue: Optional[asyncio.Queue] = None
+
+# Process results above this many characters are streamed instead of buffered
+STREAM_THRESHOLD_CHARS = 64 * 1024
+STREAM_CHUNK_CHARS = 16 * 1024
+
+# Second-resolution ISO timestamp, refreshed by _timestamp_ticker
+_current_timestamp = datetime.now().isoformat(timespec="seconds")
+
+# Warmup must never hold up startup when an integration service is down
+WARMUP_TIMEOUT = httpx.Timeout(2.0)
+
+
+async def _warm_integration_connections(session) -> None:
+    """Open keep-alive connections to integration services ahead of first use."""
+    integration = atlas_config.integration
+    urls = (
+        integration.memory_server_url,
+        integration.llm_server_url,
+        integration.gui_server_url,
+    )
+    
+    async def _warm(url: str) -> None:
+        await session.head(url, timeout=WARMUP_TIMEOUT, follow_redirects=False)
+    
+    # Probe all services concurrently: startup pays one RTT, not three
+    results = await asyncio.gather(*(_warm(url) for url in urls), return_exceptions=True)
+    if logger.isEnabledFor(logging.DEBUG):
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                logger.debug("Connection warmup skipped for %s: %s", url, result)
+
+
+async def _timestamp_ticker() -> None:
+    """Refresh the cached ISO timestamp once per second."""
+    global _current_timestamp
+    while True:
+        _current_timestamp = datetime.now().isoformat(timespec="seconds")
+        await asyncio.sleep(1)
+
+
+async def _process_batch_worker(queue: asyncio.Queue) -> None:
+    """
+    Drain queued process requests into batches.
+    
+    Collects up to BATCH_MAX_SIZE requests, then resolves each request
+    future with its slice of the batched result. A lone request is
+    flushed immediately; only when others are already queued does the
+    worker wait BATCH_MAX_WAIT_SECONDS once for more to arrive.
+    
+    Items are only taken with get_nowait(): cancelling a pending
+    queue.get() (as wait_for does on timeout before Python 3.12) can drop
+    an item it already dequeued, leaving that request's future unresolved.
+    """
+    def _drain(batch: list) -> None:
+        while len(batch) < BATCH_MAX_SIZE:
+            try:
+                batch.append(queue.get_nowait())
+            except asyncio.QueueEmpty:
+                return
+    
+    while True:
+        batch = [await queue.get()]
+        _drain(batch)
+        
+        # Under load, give the batch one short window to fill up
+        if 1 < len(batch) < BATCH_MAX_SIZE:
+            await asyncio.sleep(BATCH_MAX_WAIT_SECONDS)
+            _drain(batch)
+        
+        try:
+            results = await _atlas_internal_process_batch(
+                [(input_data, mode, options) for input_data, mode, options, _ in batch]
+            )
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            continue
+        
+        for (*_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared resources at startup and release them on shutdown."""
+    global _process_queue
+    
+    session = await get_session()
+    app.state.session = session
+    await _warm_integration_connections(session)
+    
+    _process_queue = asyncio.Queue()
+    background_tasks = (
+        asyncio.create_task(_process_batch_worker(_process_queue)),
+        asyncio.create_task(_timestamp_ticker()),
+    )
+    
+    yield
+    
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    _process_queue = None
+    await close_session()
+
+
 # FastAPI app
 app = FastAPI(
     title="ATLAS Server",
     description="Black-box enhancement system - Public interface only",
     version="1.0.0",
     docs_url="/atlas/docs",
-    redoc_url="/atlas/redoc"
+    redoc_url="/atlas/redoc",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Compress larger responses
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# CORS middleware (driven by security config, skipped when disabled)
+if atlas_config.security.cors_enabled:
+    cors_origins = list(atlas_config.security.cors_origins)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=cors_origins,
+        # Credentials are only valid with explicit origins (not "*")
+        allow_credentials="*" not in cors_origins,
+        allow_methods=["GET", "POST"],  # Only methods used by public endpoints
+        allow_headers=["*"],
+    )
 
-# Server startup time
-STARTUP_TIME = datetime.now()
+# Server startup reference for uptime (monotonic, immune to clock changes)
+STARTUP_MONO = time.monotonic()
+
+
+# Pre-serialized error body built from the schema once; only the
+# timestamp is substituted per response (no pydantic work on errors)
+_ERROR_TEMPLATE = AtlasErrorResponse(
+    message="ATLAS processing error - contact administrator",
+    error_code="ATLAS_ERROR",
+    timestamp="%s"
+).model_dump_json().encode()
 
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     """Global exception handler - no internal details exposed."""
-    logger.error(f"ATLAS error on {request.url}: {str(exc)}")
-    return JSONResponse(
+    logger.error("ATLAS error on %s: %s", request.url, exc)
+    return Response(
         status_code=500,
-        content=AtlasErrorResponse(
-            message="ATLAS processing error - contact administrator",
-            error_code="ATLAS_ERROR",
-            timestamp=datetime.now().isoformat()
-        ).dict()
+        content=_ERROR_TEMPLATE % _current_timestamp.encode(),
+        media_type="application/json"
     )
 
 
+def _iter_process_response(
+    result: str,
+    metadata: Dict[str, Any],
+    processing_time_ms: float
+) -> Iterator[bytes]:
+    """
+    Yield an AtlasProcessResponse JSON body in chunks.
+    
+    Field order and encoding match AtlasProcessResponse.model_dump() via
+    orjson, so clients see the same document as the buffered path.
+    """
+    yield b'{"success":true,"result":"'
+    for offset in range(0, len(result), STREAM_CHUNK_CHARS):
+        # orjson escapes the chunk; strip the surrounding quotes
+        yield orjson.dumps(result[offset:offset + STREAM_CHUNK_CHARS])[1:-1]
+    yield b'",' + orjson.dumps({
+        "metadata": metadata,
+        "processing_time_ms": processing_time_ms
+    })[1:]
+
+
+# Handlers return ORJSONResponse directly: response_model stays for the
+# OpenAPI schema, but FastAPI skips re-validating already-typed models.
+
 @app.post("/atlas/v1/process", response_model=AtlasProcessResponse)
 async def atlas_process_endpoint(request: AtlasProcessRequest):
     """
@@ -80,7 +255,7 @@ async def atlas_process_endpoint(request: AtlasProcessRequest):
     Internal processing algorithms are completely opaque.
     """
     try:
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         # BLACK BOX: Internal processing is opaque
         # This would call atlas.core.* functions (not documented)
@@ -90,17 +265,28 @@ async def atlas_process_endpoint(request: AtlasProcessRequest):
             request.options
         )
         
-        processing_time = (time.time() - start_time) * 1000
+        processing_time = (time.perf_counter_ns() - start_ns) / 1_000_000
+        
+        if len(processed_result) > STREAM_THRESHOLD_CHARS:
+            return StreamingResponse(
+                _iter_process_response(
+                    processed_result,
+                    {"mode": request.mode.value},
+                    processing_time
+                ),
+                media_type="application/json"
+            )
         
-        return AtlasProcessResponse(
+        response = AtlasProcessResponse(
             success=True,
             result=processed_result,
             metadata={"mode": request.mode.value},
             processing_time_ms=processing_time
         )
+        return ORJSONResponse(response.model_dump())
         
     except Exception as e:
-        logger.error(f"ATLAS process error: {str(e)}")
+        logger.error("ATLAS process error: %s", e)
         raise HTTPException(
             status_code=500, 
             detail="ATLAS processing failed"
@@ -115,8 +301,6 @@ async def atlas_enhance_endpoint(request: AtlasEnhanceRequest):
     Enhancement algorithms are black-box - no implementation details exposed.
     """
     try:
-        start_time = time.time()
-        
         # BLACK BOX: Enhancement algorithms are opaque
         enhanced_content, improvements, confidence = await _atlas_internal_enhance(
             request.content,
@@ -124,15 +308,16 @@ async def atlas_enhance_endpoint(request: AtlasEnhanceRequest):
             request.parameters
         )
         
-        return AtlasEnhanceResponse(
+        response = AtlasEnhanceResponse(
             success=True,
             enhanced_content=enhanced_content,
             improvements=improvements,
             confidence_score=confidence
         )
+        return ORJSONResponse(response.model_dump())
         
     except Exception as e:
-        logger.error(f"ATLAS enhance error: {str(e)}")
+        logger.error("ATLAS enhance error: %s", e)
         raise HTTPException(
             status_code=500,
             detail="ATLAS enhancement failed"
@@ -146,9 +331,9 @@ async def atlas_status_endpoint():
     
     Only public status information is exposed - internal metrics are opaque.
     """
-    uptime = (datetime.now() - STARTUP_TIME).total_seconds()
+    uptime = time.monotonic() - STARTUP_MONO
     
-    return AtlasStatusResponse(
+    response = AtlasStatusResponse(
         status="healthy",
         version="1.0.0",
         uptime_seconds=uptime,
@@ -159,6 +344,20 @@ async def atlas_status_endpoint():
             "/atlas/health"
         ]
     )
+    return ORJSONResponse(response.model_dump())
+
+
+@app.get("/atlas/debug/spans", include_in_schema=False)
+async def atlas_debug_spans_endpoint():
+    """
+    Recent internal trace spans (debug mode only).
+    
+    Not part of the public interface: hidden from the OpenAPI schema and
+    answered with 404 unless server.debug is set.
+    """
+    if not atlas_config.server.debug:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return ORJSONResponse(_recent_spans())
 
 
 @app.get("/atlas/health", response_model=AtlasHealthResponse)
@@ -168,18 +367,58 @@ async def atlas_health_endpoint():
     
     Simple health verification - internal health metrics are opaque.
     """
-    start_time = time.time()
+    start_ns = time.perf_counter_ns()
     
     # BLACK BOX: Internal health checks are opaque
     is_healthy = await _atlas_internal_health_check()
     
-    response_time = (time.time() - start_time) * 1000
+    response_time = (time.perf_counter_ns() - start_ns) / 1_000_000
     
-    return AtlasHealthResponse(
+    response = AtlasHealthResponse(
         healthy=is_healthy,
-        timestamp=datetime.now().isoformat(),
+        timestamp=_current_timestamp,
         response_time_ms=response_time
     )
+    return ORJSONResponse(response.model_dump())
+
+
+# Lightweight tracing for black-box calls: one perf_counter_ns delta per
+# span, recorded in-process (no log formatting on the hot path)
+current_span_id: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar(
+    "atlas_span_id", default=None
+)
+_span_ids = itertools.count(1)
+# (span_id, parent_span_id, name, duration_ns)
+TRACE_SPANS: deque = deque(maxlen=1024)
+DEBUG_SPAN_LIMIT = 50
+
+
+@contextmanager
+def _trace_span(name: str) -> Iterator[int]:
+    """Record the duration of a black-box call under a new span id."""
+    parent_id = current_span_id.get()
+    span_id = next(_span_ids)
+    token = current_span_id.set(span_id)
+    start_ns = time.perf_counter_ns()
+    try:
+        yield span_id
+    finally:
+        TRACE_SPANS.append((span_id, parent_id, name, time.perf_counter_ns() - start_ns))
+        current_span_id.reset(token)
+
+
+def _recent_spans(limit: int = DEBUG_SPAN_LIMIT) -> List[Dict[str, Any]]:
+    """Most recent spans, newest first, as served by the debug spans route."""
+    recent = list(itertools.islice(reversed(TRACE_SPANS), limit))
+    return [
+        {
+            "span_id": span_id,
+            "parent_span_id": parent_id,
+            "name": name,
+            "duration_ms": duration_ns / 1_000_000,
+        }
+        for span_id, parent_id, name, duration_ns in recent
+    ]
 
 
 # BLACK BOX FUNCTIONS - These would be implemented in atlas.core.*
@@ -188,13 +427,33 @@ async def atlas_health_endpoint():
 async def _atlas_internal_process(input_data: str, mode: str, options: dict) -> str:
     """
     INTERNAL FUNCTION - Implementation opaque.
-    This would call atlas.core processing functions.
+    Queues the request for batched processing and awaits its result.
     """
-    # Simulate black-box processing
-    await asyncio.sleep(0.1)  # Simulate processing time
+    if _process_queue is None:
+        # Batch worker not running (app used without lifespan)
+        results = await _atlas_internal_process_batch([(input_data, mode, options)])
+        return results[0]
     
-    # In real implementation, this would call opaque core functions
-    return f"[ATLAS-PROCESSED] {input_data} [MODE: {mode}]"
+    future = asyncio.get_running_loop().create_future()
+    await _process_queue.put((input_data, mode, options, future))
+    return await future
+
+
+async def _atlas_internal_process_batch(items: List[Tuple[str, str, dict]]) -> List[str]:
+    """
+    INTERNAL FUNCTION - Implementation opaque.
+    This would call atlas.core processing functions once per batch.
+    """
+    with _trace_span("process_batch"):
+        # Simulate black-box processing (fixed cost paid once per batch)
+        if atlas_config.server.debug:
+            await asyncio.sleep(0.1)  # Simulate processing time
+        
+        # In real implementation, this would call opaque core functions
+        return [
+            f"[ATLAS-PROCESSED] {input_data} [MODE: {mode}]"
+            for input_data, mode, _ in items
+        ]
 
 
 async def _atlas_internal_enhance(content: str, enhancement_type: str, parameters: dict) -> tuple:
@@ -202,14 +461,16 @@ async def _atlas_internal_enhance(content: str, enhancement_type: str, parameter
     INTERNAL FUNCTION - Implementation opaque.
     This would call atlas.core enhancement algorithms.
     """
-    # Simulate black-box enhancement
-    await asyncio.sleep(0.15)
-    
-    enhanced = f"[ATLAS-ENHANCED] {content} [TYPE: {enhancement_type}]"
-    improvements = [f"Applied {enhancement_type} enhancement", "Optimized structure"]
-    confidence = 0.85
-    
-    return enhanced, improvements, confidence
+    with _trace_span("enhance"):
+        # Simulate black-box enhancement
+        if atlas_config.server.debug:
+            await asyncio.sleep(0.15)
+        
+        enhanced = f"[ATLAS-ENHANCED] {content} [TYPE: {enhancement_type}]"
+        improvements = [f"Applied {enhancement_type} enhancement", "Optimized structure"]
+        confidence = 0.85
+        
+        return enhanced, improvements, confidence
 
 
 async def _atlas_internal_health_check() -> bool:
@@ -217,19 +478,28 @@ async def _atlas_internal_health_check() -> bool:
     INTERNAL FUNCTION - Implementation opaque.
     This would check atlas.core system health.
     """
-    # Simulate internal health verification
-    await asyncio.sleep(0.05)
-    return True
+    with _trace_span("health_check"):
+        # Simulate internal health verification
+        if atlas_config.server.debug:
+            await asyncio.sleep(0.05)
+        return True
 
 
 if __name__ == "__main__":
     logger.info("Starting ATLAS Server (Black-box system)")
     logger.info("Only public interfaces are accessible")
     
+    # Stateless endpoints: one worker per core unless configured explicitly
+    workers = atlas_config.server.workers or max(1, os.cpu_count() or 1)
+    logger.info("Starting %d ATLAS worker(s)", workers)
+    
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8004,
+        host=atlas_config.server.host,
+        port=atlas_config.server.port,
+        workers=workers,
         reload=False,  # Disable reload to maintain black-box nature
+        loop=EVENT_LOOP,
+        http=HTTP_PROTOCOL,
         log_level="info"
     )
\ No newline at end of file
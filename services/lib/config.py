@@ -8,8 +8,41 @@ variable override support.
 import os
 import yaml
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
-from pydantic import BaseModel, validator
+from typing import Any, Dict, Optional, Tuple, Union
+from pydantic import BaseModel, ConfigDict
+
+
+# Environment variable -> nested configuration path
+ENV_MAPPINGS = {
+    'DATABASE_URL': ['database', 'url'],
+    'REDIS_URL': ['database', 'redis_url'],
+    'MEMORY_SERVER_PORT': ['server', 'memory_server_port'],
+    'LLM_SERVER_PORT': ['server', 'llm_server_port'],
+    'GUI_SERVER_PORT': ['server', 'gui_server_port'],
+    'ATLAS_SERVER_PORT': ['server', 'atlas_server_port'],
+    'LOG_LEVEL': ['log_level'],
+    'DEBUG_MODE': ['server', 'debug'],
+    'SECRET_KEY': ['security', 'secret_key'],
+    'JWT_SECRET_KEY': ['security', 'jwt_secret_key'],
+    'MODELS_PATH': ['models', 'models_path'],
+    'DEFAULT_PROFILE': ['models', 'default_profile'],
+    'GPU_ENABLED': ['models', 'gpu_enabled'],
+    'MAX_GPU_MEMORY_GB': ['models', 'max_gpu_memory_gb'],
+    'PULSAR_URL': ['messaging', 'pulsar_url'],
+    'NATS_URL': ['messaging', 'nats_url'],
+    'ATLAS_ENABLED': ['atlas', 'enabled'],
+    'ATLAS_ENDPOINT': ['atlas', 'endpoint'],
+}
+
+# Flattened (env_var, parent_keys, final_key) entries, resolved once at import
+_ENV_OVERRIDES = tuple(
+    (env_var, tuple(path[:-1]), path[-1])
+    for env_var, path in ENV_MAPPINGS.items()
+)
+
+# Accepted boolean spellings for environment overrides
+_TRUE_VALUES = frozenset({'true', 'yes', '1', 'on'})
+_FALSE_VALUES = frozenset({'false', 'no', '0', 'off'})
 
 
 class ConfigError(Exception):
@@ -20,10 +53,8 @@ class ConfigError(Exception):
 class BaseConfig(BaseModel):
     """Base configuration class with common settings."""
     
-    class Config:
-        env_file = '.env'
-        env_file_encoding = 'utf-8'
-        case_sensitive = False
+    # Static settings: immutable after load, unknown keys ignored
+    model_config = ConfigDict(frozen=True, extra="ignore")
 
 
 class DatabaseConfig(BaseConfig):
@@ -94,6 +125,8 @@ class ConfigManager:
     def __init__(self, config_dir: str = "config"):
         self.config_dir = Path(config_dir)
         self._config: Optional[AppConfig] = None
+        self._config_file = "system.yaml"
+        self._config_mtime: Optional[float] = None
     
     def load_config(self, config_file: str = "system.yaml") -> AppConfig:
         """Load configuration from YAML file with environment overrides."""
@@ -103,6 +136,7 @@ class ConfigManager:
             raise ConfigError(f"Configuration file not found: {config_path}")
         
         try:
+            mtime = config_path.stat().st_mtime
             with open(config_path, 'r') as f:
                 yaml_data = yaml.safe_load(f)
             
@@ -110,6 +144,8 @@ class ConfigManager:
             yaml_data = self._apply_env_overrides(yaml_data)
             
             self._config = AppConfig(**yaml_data)
+            self._config_file = config_file
+            self._config_mtime = mtime
             return self._config
             
         except yaml.YAMLError as e:
@@ -118,11 +154,19 @@ class ConfigManager:
             raise ConfigError(f"Error loading configuration: {e}")
     
     def get_config(self) -> AppConfig:
-        """Get current configuration, loading default if not loaded."""
-        if self._config is None:
-            self.load_config()
+        """Get current configuration, re-parsing only when the file changed."""
+        if self._config is None or self._file_changed():
+            self.load_config(self._config_file)
         return self._config
     
+    def _file_changed(self) -> bool:
+        """Check whether the loaded configuration file was modified on disk."""
+        try:
+            mtime = (self.config_dir / self._config_file).stat().st_mtime
+        except OSError:
+            return False
+        return mtime != self._config_mtime
+    
     def reload_config(self) -> AppConfig:
         """Reload configuration from file."""
         self._config = None
@@ -130,59 +174,40 @@ class ConfigManager:
     
     def _apply_env_overrides(self, config_data: Dict[str, Any]) -> Dict[str, Any]:
         """Apply environment variable overrides to configuration."""
-        env_mappings = {
-            'DATABASE_URL': ['database', 'url'],
-            'REDIS_URL': ['database', 'redis_url'],
-            'MEMORY_SERVER_PORT': ['server', 'memory_server_port'],
-            'LLM_SERVER_PORT': ['server', 'llm_server_port'],
-            'GUI_SERVER_PORT': ['server', 'gui_server_port'],
-            'ATLAS_SERVER_PORT': ['server', 'atlas_server_port'],
-            'LOG_LEVEL': ['log_level'],
-            'DEBUG_MODE': ['server', 'debug'],
-            'SECRET_KEY': ['security', 'secret_key'],
-            'JWT_SECRET_KEY': ['security', 'jwt_secret_key'],
-            'MODELS_PATH': ['models', 'models_path'],
-            'DEFAULT_PROFILE': ['models', 'default_profile'],
-            'GPU_ENABLED': ['models', 'gpu_enabled'],
-            'MAX_GPU_MEMORY_GB': ['models', 'max_gpu_memory_gb'],
-            'PULSAR_URL': ['messaging', 'pulsar_url'],
-            'NATS_URL': ['messaging', 'nats_url'],
-            'ATLAS_ENABLED': ['atlas', 'enabled'],
-            'ATLAS_ENDPOINT': ['atlas', 'endpoint'],
-        }
-        
-        for env_var, config_path in env_mappings.items():
-            env_value = os.getenv(env_var)
+        env_get = os.environ.get
+        for env_var, parent_keys, final_key in _ENV_OVERRIDES:
+            env_value = env_get(env_var)
             if env_value is not None:
-                self._set_nested_config(config_data, config_path, env_value)
+                self._set_nested_config(config_data, parent_keys, final_key, env_value)
         
         return config_data
     
     def _set_nested_config(self, config_data: Dict[str, Any], 
-                          path: list[str], value: str) -> None:
+                          parent_keys: Tuple[str, ...], final_key: str,
+                          value: str) -> None:
         """Set nested configuration value from environment variable."""
         current = config_data
         
         # Navigate to parent
-        for key in path[:-1]:
-            if key not in current:
-                current[key] = {}
-            current = current[key]
+        for key in parent_keys:
+            current = current.setdefault(key, {})
         
         # Set final value with type conversion
-        final_key = path[-1]
         current[final_key] = self._convert_env_value(value)
     
     def _convert_env_value(self, value: str) -> Union[str, int, bool]:
         """Convert environment variable string to appropriate type."""
         # Boolean conversion
-        if value.lower() in ('true', 'yes', '1', 'on'):
+        lowered = value.lower()
+        if lowered in _TRUE_VALUES:
             return True
-        if value.lower() in ('false', 'no', '0', 'off'):
+        if lowered in _FALSE_VALUES:
             return False
         
-        # Integer conversion
-        if value.isdigit():
+        # Integer conversion: plain ASCII digits with an optional leading
+        # minus only (int() alone would also take "1_000" and " 42 ")
+        digits = value[1:] if value.startswith('-') else value
+        if digits.isascii() and digits.isdigit():
             return int(value)
         
         # String (default)
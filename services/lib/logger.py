@@ -5,11 +5,164 @@ Provides structured logging with context injection and multiple output handlers.
 """
 
 import sys
+import gzip
 import json
+import re
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Union
 from loguru import logger
-from datetime import datetime
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _dumps(value: Any) -> str:
+    """Serialize a context value to JSON (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(value, default=str).decode("utf-8")
+    return json.dumps(value, default=str)
+
+
+# Default sink formats, built once at import. loguru compiles a string
+# format into its template once per sink at add() time; a callable format
+# would instead be re-parsed (color markup included) on every record.
+STRUCTURED_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
+    "<level>{level: <8}</level> | "
+    "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
+    "{extra[context]} | "
+    "<level>{message}</level>"
+)
+
+PLAIN_FORMAT = (
+    "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
+    "<level>{level: <8}</level> | "
+    "<cyan>{name}</cyan> | "
+    "<level>{message}</level>"
+)
+
+
+def _is_raw(record) -> bool:
+    """Filter for records carrying a preserialized JSON payload."""
+    return "_raw" in record["extra"]
+
+
+def _not_raw(record) -> bool:
+    """Filter keeping preserialized records out of the serializing sinks."""
+    return "_raw" not in record["extra"]
+
+
+_SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+_DURATION_UNITS = {"hour": 3600, "day": 86400, "week": 7 * 86400}
+
+
+def _parse_size(value: str) -> int:
+    """Parse a rotation size such as "100 MB" into bytes."""
+    match = re.fullmatch(r"\s*([\d.]+)\s*([KMG]?B)\s*", value.upper())
+    if match is None:
+        raise ValueError(f"Invalid log rotation size: {value!r}")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+
+def _parse_duration(value: str) -> float:
+    """Parse a retention period such as "30 days" into seconds."""
+    match = re.fullmatch(r"\s*(\d+)\s*(hour|day|week)s?\s*", value.lower())
+    if match is None:
+        raise ValueError(f"Invalid log retention: {value!r}")
+    return int(match.group(1)) * _DURATION_UNITS[match.group(2)]
+
+
+class BufferedSink:
+    """
+    Block-buffered file sink with size rotation.
+    
+    Records are written through a large open() buffer instead of loguru's
+    line buffering. The buffer is flushed by a timer thread every
+    flush_interval seconds and immediately on ERROR and above, so at most
+    one interval of lower-severity records is ever unwritten. Rotated files
+    are compressed and pruned after the retention period, like loguru's
+    own file sink.
+    """
+    
+    _ERROR_NO = 40
+    
+    def __init__(
+        self,
+        path: Path,
+        max_size: str,
+        retention: str,
+        compression: Optional[str],
+        buffer_size: int = 64 * 1024,
+        flush_interval: float = 1.0,
+    ):
+        self._path = Path(path)
+        self._max_bytes = _parse_size(max_size)
+        self._retention_seconds = _parse_duration(retention)
+        self._compression = compression
+        self._buffer_size = buffer_size
+        self._lock = threading.Lock()
+        self._open()
+        
+        self._stopped = threading.Event()
+        self._flusher = threading.Thread(
+            target=self._flush_periodically, args=(flush_interval,),
+            name="log-flush", daemon=True
+        )
+        self._flusher.start()
+    
+    def _open(self) -> None:
+        self._file = open(self._path, "ab", buffering=self._buffer_size)
+        self._size = self._file.tell()
+    
+    def write(self, message) -> None:
+        data = message.encode("utf-8")
+        with self._lock:
+            if self._size and self._size + len(data) > self._max_bytes:
+                self._rotate()
+            self._file.write(data)
+            self._size += len(data)
+            if message.record["level"].no >= self._ERROR_NO:
+                self._file.flush()
+    
+    def _flush_periodically(self, interval: float) -> None:
+        while not self._stopped.wait(interval):
+            with self._lock:
+                if not self._file.closed:
+                    self._file.flush()
+    
+    def _rotate(self) -> None:
+        """Close the current file, rename it with a timestamp and reopen."""
+        self._file.close()
+        stamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S_%f")
+        rotated = self._path.with_name(f"{self._path.stem}.{stamp}{self._path.suffix}")
+        self._path.rename(rotated)
+        
+        if self._compression in ("gz", "gzip"):
+            with open(rotated, "rb") as src, gzip.open(f"{rotated}.gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            rotated.unlink()
+        
+        cutoff = time.time() - self._retention_seconds
+        for old in self._path.parent.glob(f"{self._path.stem}.*{self._path.suffix}*"):
+            if old.stat().st_mtime < cutoff:
+                old.unlink()
+        
+        self._open()
+    
+    def stop(self) -> None:
+        """Called by loguru when the sink is removed; flushes and closes the file."""
+        self._stopped.set()
+        self._flusher.join()
+        with self._lock:
+            self._file.close()
 
 
 class LoggerConfig:
@@ -25,6 +178,10 @@ class LoggerConfig:
         compression: str = "gz",
         structured: bool = True,
         include_context: bool = True,
+        log_name: str = "ai-server",
+        async_io: bool = True,
+        buffer_size: int = 64 * 1024,
+        flush_interval: float = 1.0,
     ):
         self.level = level
         self.format_string = format_string or self._default_format(structured)
@@ -34,155 +191,248 @@ class LoggerConfig:
         self.compression = compression
         self.structured = structured
         self.include_context = include_context
+        self.log_name = log_name
+        self.async_io = async_io
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
     
     def _default_format(self, structured: bool) -> str:
         """Get default log format."""
-        if structured:
-            return (
-                "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
-                "<level>{level: <8}</level> | "
-                "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> | "
-                "{extra[context]} | "
-                "<level>{message}</level>"
-            )
-        else:
-            return (
-                "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | "
-                "<level>{level: <8}</level> | "
-                "<cyan>{name}</cyan> | "
-                "<level>{message}</level>"
-            )
+        return STRUCTURED_FORMAT if structured else PLAIN_FORMAT
 
 
 class ContextLogger:
     """Logger with context injection capabilities."""
     
+    # Severity numbers used by the early-exit level guard
+    _DEBUG_NO = 10
+    _INFO_NO = 20
+    _WARNING_NO = 30
+    _ERROR_NO = 40
+    
+    # Config whose sinks are currently installed on the shared loguru logger
+    _installed_config: Optional[LoggerConfig] = None
+    
     def __init__(self, name: str, config: Optional[LoggerConfig] = None):
         self.name = name
         self.config = config or LoggerConfig()
-        self.context: Dict[str, Any] = {}
+        self._context: Dict[str, Any] = {}
+        self._context_cache: Optional[str] = None  # None = needs rebuild
+        # Context is injected once per record by a patcher, not per sink
+        self._logger = logger.patch(self._patch_record)
         self._setup_logger()
     
+    @property
+    def context(self) -> Mapping[str, Any]:
+        """Read-only view of the current context (modify via add_context/clear_context)."""
+        return MappingProxyType(self._context)
+    
+    @context.setter
+    def context(self, value: Mapping[str, Any]) -> None:
+        self._context = dict(value)
+        self._context_cache = None
+    
     def _setup_logger(self) -> None:
         """Setup loguru logger with configuration."""
+        # Lowest severity any sink accepts; records below it are skipped early
+        self._min_level = logger.level(self.config.level).no
+        self._install_handlers(self.config)
+    
+    @classmethod
+    def _install_handlers(cls, config: LoggerConfig, force: bool = False) -> None:
+        """
+        Install the shared sinks on the global loguru logger.
+        
+        Sinks are process-wide: they are only rebuilt when a different config
+        is applied (or force=True), not once per component logger. Records
+        are attributed to their component through extra["component"].
+        """
+        if cls._installed_config is config and not force:
+            return
+        
         # Remove default handler
         logger.remove()
         
+        # Defaults for records not emitted through a ContextLogger
+        logger.configure(extra={"context": "", "component": ""})
+        
         # Console handler
         logger.add(
             sys.stderr,
-            format=self.config.format_string,
-            level=self.config.level,
-            filter=self._context_filter,
+            format=config.format_string,
+            level=config.level,
         )
         
-        # File handler for all logs
-        self.config.log_dir.mkdir(parents=True, exist_ok=True)
+        # File handler for all logs (block-buffered, flushed on a timer)
+        config.log_dir.mkdir(parents=True, exist_ok=True)
         logger.add(
-            self.config.log_dir / f"{self.name}.log",
-            format=self.config.format_string,
-            level=self.config.level,
-            rotation=self.config.max_size,
-            retention=self.config.retention,
-            compression=self.config.compression,
-            filter=self._context_filter,
-            serialize=self.config.structured,
+            BufferedSink(
+                config.log_dir / f"{config.log_name}.log",
+                max_size=config.max_size,
+                retention=config.retention,
+                compression=config.compression,
+                buffer_size=config.buffer_size,
+                flush_interval=config.flush_interval,
+            ),
+            format=config.format_string,
+            level=config.level,
+            colorize=False,
+            serialize=config.structured,
+            filter=_not_raw,
+            enqueue=config.async_io,  # Disk I/O on loguru's writer thread
         )
         
         # Error file handler
         logger.add(
-            self.config.log_dir / f"{self.name}_error.log",
-            format=self.config.format_string,
+            config.log_dir / f"{config.log_name}_error.log",
+            format=config.format_string,
             level="ERROR",
-            rotation=self.config.max_size,
-            retention=self.config.retention,
-            compression=self.config.compression,
-            filter=self._context_filter,
-            serialize=self.config.structured,
+            rotation=config.max_size,
+            retention=config.retention,
+            compression=config.compression,
+            serialize=config.structured,
+            filter=_not_raw,
+            enqueue=config.async_io,
+        )
+        
+        # Preserialized payloads from log_raw(), written as-is; the file is
+        # only created once the first payload arrives
+        logger.add(
+            config.log_dir / f"{config.log_name}_raw.jsonl",
+            format="{extra[_raw]}",
+            level=config.level,
+            rotation=config.max_size,
+            retention=config.retention,
+            compression=config.compression,
+            filter=_is_raw,
+            enqueue=config.async_io,
+            delay=True,
         )
+        
+        cls._installed_config = config
     
-    def _context_filter(self, record) -> bool:
-        """Filter to inject context into log records."""
+    def _patch_record(self, record) -> None:
+        """Patcher injecting context into log records (runs once per record)."""
         if self.config.include_context:
-            context_str = self._format_context()
-            record["extra"]["context"] = context_str
+            record["extra"]["context"] = self._format_context()
         else:
             record["extra"]["context"] = ""
         
         record["extra"]["component"] = self.name
-        return True
     
     def _format_context(self) -> str:
-        """Format context dictionary for display."""
-        if not self.context:
-            return ""
+        """Format context dictionary for display (cached until context changes)."""
+        if self._context_cache is not None:
+            return self._context_cache
+        
+        if not self._context:
+            self._context_cache = ""
+            return self._context_cache
         
-        context_parts = []
-        for key, value in self.context.items():
-            if isinstance(value, (dict, list)):
-                value_str = json.dumps(value, default=str)
+        # Single join over key, "=", value, " " pieces (no per-pair f-string)
+        parts = []
+        append = parts.append
+        for key, value in self._context.items():
+            if isinstance(value, str):
+                value_str = value
+            elif isinstance(value, (dict, list)):
+                value_str = _dumps(value)
             else:
                 value_str = str(value)
-            context_parts.append(f"{key}={value_str}")
+            append(key)
+            append("=")
+            append(value_str)
+            append(" ")
+        parts.pop()  # Drop trailing separator
         
-        return " ".join(context_parts)
+        self._context_cache = "".join(parts)
+        return self._context_cache
     
     def with_context(self, **kwargs) -> 'ContextLogger':
         """Create logger with additional context."""
         new_logger = ContextLogger(self.name, self.config)
-        new_logger.context = {**self.context, **kwargs}
+        new_logger.context = {**self._context, **kwargs}
         return new_logger
     
     def add_context(self, **kwargs) -> None:
         """Add context to current logger."""
-        self.context.update(kwargs)
+        self._context.update(kwargs)
+        self._context_cache = None
     
     def clear_context(self) -> None:
         """Clear all context."""
-        self.context.clear()
+        self._context.clear()
+        self._context_cache = None
+    
+    def _bound(self, kwargs: Dict[str, Any]):
+        """Return the logger bound to kwargs (no bind/clone when empty)."""
+        return self._logger.bind(**kwargs) if kwargs else self._logger
     
     def debug(self, message: str, **kwargs) -> None:
         """Log debug message."""
-        logger.bind(**kwargs).debug(message)
+        if self._DEBUG_NO < self._min_level:
+            return
+        self._bound(kwargs).debug(message)
     
     def info(self, message: str, **kwargs) -> None:
         """Log info message."""
-        logger.bind(**kwargs).info(message)
+        if self._INFO_NO < self._min_level:
+            return
+        self._bound(kwargs).info(message)
     
     def warning(self, message: str, **kwargs) -> None:
         """Log warning message."""
-        logger.bind(**kwargs).warning(message)
+        if self._WARNING_NO < self._min_level:
+            return
+        self._bound(kwargs).warning(message)
     
     def error(self, message: str, exception: Optional[Exception] = None, **kwargs) -> None:
         """Log error message with optional exception."""
+        if self._ERROR_NO < self._min_level:
+            return
         if exception:
-            logger.bind(**kwargs).opt(exception=True).error(f"{message}: {exception}")
+            self._bound(kwargs).opt(exception=True).error(f"{message}: {exception}")
         else:
-            logger.bind(**kwargs).error(message)
+            self._bound(kwargs).error(message)
     
     def critical(self, message: str, exception: Optional[Exception] = None, **kwargs) -> None:
         """Log critical message with optional exception."""
         if exception:
-            logger.bind(**kwargs).opt(exception=True).critical(f"{message}: {exception}")
+            self._bound(kwargs).opt(exception=True).critical(f"{message}: {exception}")
         else:
-            logger.bind(**kwargs).critical(message)
+            self._bound(kwargs).critical(message)
     
     def exception(self, message: str, **kwargs) -> None:
         """Log exception with full traceback."""
-        logger.bind(**kwargs).opt(exception=True).error(message)
+        self._bound(kwargs).opt(exception=True).error(message)
+    
+    def log_raw(self, level: str, message: str, extra_json: bytes) -> None:
+        """
+        Log an already serialized JSON payload.
+        
+        extra_json is written unchanged as one line of {log_name}_raw.jsonl
+        and skips context formatting and the serializing file sinks; the
+        console still shows message.
+        """
+        if logger.level(level).no < self._min_level:
+            return
+        logger.bind(component=self.name, _raw=extra_json.decode("utf-8")).log(level, message)
 
 
 class ComponentLogger:
     """Component-specific logger factory."""
     
-    _loggers: Dict[str, ContextLogger] = {}
+    # Bounded LRU of component loggers (dynamic component names must not leak)
+    MAX_LOGGERS = 256
+    _loggers: "OrderedDict[str, ContextLogger]" = OrderedDict()
     _config: Optional[LoggerConfig] = None
     
     @classmethod
     def configure(cls, config: LoggerConfig) -> None:
         """Configure global logger settings."""
         cls._config = config
-        # Update existing loggers
+        # Rebuild the shared sinks once, then refresh level guards
+        ContextLogger._install_handlers(config, force=True)
         for logger_instance in cls._loggers.values():
             logger_instance.config = config
             logger_instance._setup_logger()
@@ -190,11 +440,19 @@ class ComponentLogger:
     @classmethod
     def get_logger(cls, component: str) -> ContextLogger:
         """Get or create logger for component."""
-        if component not in cls._loggers:
-            config = cls._config or LoggerConfig()
-            cls._loggers[component] = ContextLogger(component, config)
+        logger_instance = cls._loggers.get(component)
+        if logger_instance is not None:
+            cls._loggers.move_to_end(component)
+            return logger_instance
+        
+        if cls._config is None:
+            cls._config = LoggerConfig()
+        logger_instance = ContextLogger(component, cls._config)
+        cls._loggers[component] = logger_instance
+        if len(cls._loggers) > cls.MAX_LOGGERS:
+            cls._loggers.popitem(last=False)
         
-        return cls._loggers[component]
+        return logger_instance
     
     @classmethod
     def set_level(cls, level: str) -> None:
@@ -204,7 +462,8 @@ class ComponentLogger:
         else:
             cls._config = LoggerConfig(level=level)
         
-        # Update all existing loggers
+        # Rebuild the shared sinks once, then refresh level guards
+        ContextLogger._install_handlers(cls._config, force=True)
         for logger_instance in cls._loggers.values():
             logger_instance.config.level = level
             logger_instance._setup_logger()
@@ -220,6 +479,8 @@ def configure_logging(
     log_dir: str = "logs",
     structured: bool = True,
     include_context: bool = True,
+    log_name: str = "ai-server",
+    async_io: bool = True,
 ) -> None:
     """Configure global logging settings."""
     config = LoggerConfig(
@@ -227,6 +488,8 @@ def configure_logging(
         log_dir=log_dir,
         structured=structured,
         include_context=include_context,
+        log_name=log_name,
+        async_io=async_io,
     )
     ComponentLogger.configure(config)
 
@@ -237,22 +500,22 @@ class PerformanceLogger:
     
     def __init__(self, component: str):
         self.logger = get_logger(f"{component}.perf")
-        self.start_time: Optional[datetime] = None
+        self._start_ns: Optional[int] = None
         self.operation: Optional[str] = None
     
     def start_operation(self, operation: str, **context) -> None:
         """Start timing an operation."""
         self.operation = operation
-        self.start_time = datetime.now()
+        self._start_ns = time.perf_counter_ns()
         self.logger.with_context(**context).debug(f"Starting operation: {operation}")
     
     def end_operation(self, **context) -> Optional[float]:
         """End timing an operation and log duration."""
-        if not self.start_time or not self.operation:
+        if self._start_ns is None or not self.operation:
             self.logger.warning("end_operation called without start_operation")
             return None
         
-        duration = (datetime.now() - self.start_time).total_seconds()
+        duration = (time.perf_counter_ns() - self._start_ns) / 1e9
         
         self.logger.with_context(
             operation=self.operation,
@@ -261,7 +524,7 @@ class PerformanceLogger:
         ).info(f"Operation completed: {self.operation} ({duration:.3f}s)")
         
         # Reset
-        self.start_time = None
+        self._start_ns = None
         operation = self.operation
         self.operation = None
         
@@ -298,7 +561,6 @@ class AuditLogger:
             resource=resource,
             user_id=user_id,
             result=result,
-            timestamp=datetime.now().isoformat(),
             **context
         ).info(f"Action: {action} on {resource} - {result}")
     
@@ -8,9 +8,25 @@ and database management tasks in AI server operations.
 
 import subprocess
 import os
-import json
+import orjson
 import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _run_cli_task(task):
+    """Run one DuckDB CLI invocation; returns (name, (result, elapsed_ms))."""
+    name, argv, stdin = task
+    start_time = time.time()
+    result = subprocess.run(
+        argv,
+        input=stdin,
+        capture_output=True,
+        text=True
+    )
+    execution_time = (time.time() - start_time) * 1000
+    return name, (result, execution_time)
+
 
 def test_duckdb_cli():
     """Test DuckDB CLI tools functionality."""
@@ -47,22 +63,8 @@ def test_duckdb_cli():
             print("❌ DuckDB CLI not found in PATH")
             return False
         
-        # Check CLI version
-        version_result = subprocess.run(
-            ["duckdb", "--version"],
-            capture_output=True,
-            text=True
-        )
-        
-        if version_result.returncode == 0:
-            version = version_result.stdout.strip()
-            results["cli_version"] = version
-            print(f"✅ DuckDB CLI version: {version}")
-        
-        # Test SQL execution via CLI
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.sql', delete=False) as f:
-            sql_file = f.name
-            f.write("""
+        # Test SQL execution via CLI (script piped through stdin)
+        sql_script = """
                 CREATE TABLE test_metrics (
                     timestamp TIMESTAMP,
                     metric_name VARCHAR,
@@ -81,84 +83,73 @@ def test_duckdb_cli():
                 FROM test_metrics
                 GROUP BY metric_name
                 ORDER BY avg_value DESC;
-            """)
+            """
         
-        # Execute SQL file with CLI
-        start_time = time.time()
-        
-        sql_result = subprocess.run(
-            ["duckdb", ":memory:", "-c", f".read {sql_file}"],
-            capture_output=True,
-            text=True
-        )
-        
-        execution_time = (time.time() - start_time) * 1000
-        
-        if sql_result.returncode == 0:
-            results["sql_execution"] = True
-            results["performance"]["sql_execution_ms"] = round(execution_time, 2)
-            print(f"✅ SQL execution via CLI successful ({execution_time:.2f}ms)")
-            
-            # Parse output
-            output_lines = sql_result.stdout.strip().split('\n')
-            if len(output_lines) > 0:
-                print(f"   Query returned {len([l for l in output_lines if l.strip()])} result rows")
-        else:
-            print(f"❌ SQL execution failed: {sql_result.stderr}")
-        
-        # Test file database creation
         with tempfile.TemporaryDirectory() as tmpdir:
             db_file = os.path.join(tmpdir, "test.duckdb")
             
-            # Create database file
-            create_result = subprocess.run(
-                ["duckdb", db_file, "-c", "CREATE TABLE test(id INTEGER, name VARCHAR);"],
-                capture_output=True,
-                text=True
-            )
+            # Independent CLI invocations: (name, argv, stdin)
+            cli_tasks = [
+                ("version", ["duckdb", "--version"], None),
+                ("file_db", ["duckdb", db_file, "-c", "CREATE TABLE test(id INTEGER, name VARCHAR);"], None),
+                # Export streams the CSV to stdout; no target file to stat or clean up
+                ("export", ["duckdb", ":memory:", "-c",
+                            "CREATE TABLE export_test AS SELECT * FROM range(10); COPY export_test TO '/dev/stdout' (HEADER, DELIMITER ',');"], None),
+                # Note: Can't fully test interactive mode in script, just check if it would launch
+                ("help", ["duckdb", "-help"], None),
+            ]
+            
+            # Run all CLI processes concurrently (process startup dominates)
+            with ThreadPoolExecutor(max_workers=len(cli_tasks)) as executor:
+                cli_results = dict(executor.map(_run_cli_task, cli_tasks))
+            
+            # The timed SQL check runs alone so sql_execution_ms is not
+            # inflated by the concurrent processes competing for CPU
+            cli_results.update([_run_cli_task(("sql", ["duckdb", ":memory:"], sql_script))])
             
+            # Check CLI version
+            version_result, _ = cli_results["version"]
+            if version_result.returncode == 0:
+                version = version_result.stdout.strip()
+                results["cli_version"] = version
+                print(f"✅ DuckDB CLI version: {version}")
+            
+            # SQL execution
+            sql_result, execution_time = cli_results["sql"]
+            if sql_result.returncode == 0:
+                results["sql_execution"] = True
+                results["performance"]["sql_execution_ms"] = round(execution_time, 2)
+                print(f"✅ SQL execution via CLI successful ({execution_time:.2f}ms)")
+                
+                # Parse output
+                output_lines = sql_result.stdout.strip().split('\n')
+                if len(output_lines) > 0:
+                    print(f"   Query returned {len([l for l in output_lines if l.strip()])} result rows")
+            else:
+                print(f"❌ SQL execution failed: {sql_result.stderr}")
+            
+            # File database creation
+            create_result, _ = cli_results["file_db"]
             if create_result.returncode == 0 and os.path.exists(db_file):
                 results["file_database"] = True
                 file_size = os.path.getsize(db_file)
                 print(f"✅ File database creation successful ({file_size} bytes)")
             else:
                 print("❌ File database creation failed")
-        
-        # Test export functionality
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            csv_file = f.name
-        
-        export_result = subprocess.run(
-            ["duckdb", ":memory:", "-c", 
-             f"CREATE TABLE export_test AS SELECT * FROM range(10); COPY export_test TO '{csv_file}' (HEADER, DELIMITER ',');"],
-            capture_output=True,
-            text=True
-        )
-        
-        if export_result.returncode == 0 and os.path.exists(csv_file):
-            csv_size = os.path.getsize(csv_file)
-            if csv_size > 0:
-                results["export_import"] = True
-                print(f"✅ CSV export successful ({csv_size} bytes)")
-        
-        # Clean up temp files
-        try:
-            os.unlink(sql_file)
-            os.unlink(csv_file)
-        except:
-            pass
-        
-        # Test interactive mode availability
-        # Note: Can't fully test interactive mode in script, just check if it would launch
-        help_result = subprocess.run(
-            ["duckdb", "-help"],
-            capture_output=True,
-            text=True
-        )
-        
-        if "DESCRIPTION" in help_result.stdout:
-            results["interactive_mode"] = True
-            print("✅ Interactive mode available")
+            
+            # Export functionality
+            export_result, _ = cli_results["export"]
+            if export_result.returncode == 0:
+                csv_size = len(export_result.stdout)
+                if csv_size > 0:
+                    results["export_import"] = True
+                    print(f"✅ CSV export successful ({csv_size} bytes)")
+            
+            # Interactive mode availability
+            help_result, _ = cli_results["help"]
+            if "DESCRIPTION" in help_result.stdout:
+                results["interactive_mode"] = True
+                print("✅ Interactive mode available")
         
         print("\n" + "="*60)
         print("CLI TOOLS TEST SUMMARY")
@@ -188,8 +179,8 @@ def test_duckdb_cli():
         print("="*60)
         
         # Save results
-        with open('/Users/server/Code/AI-projects/AI-server/services/storage/duckdb/cli_test_results.json', 'w') as f:
-            json.dump(results, f, indent=2)
+        with open('/Users/server/Code/AI-projects/AI-server/services/storage/duckdb/cli_test_results.json', 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
         
         return results["status"] == "SUCCESS"
         
@@ -8,7 +8,7 @@ Tests embedded analytical database capabilities for OLAP operations.
 
 import duckdb
 import sys
-import json
+import orjson
 
 def test_duckdb_installation():
     """Test DuckDB installation and basic operations."""
@@ -44,33 +44,31 @@ def test_duckdb_installation():
             results["basic_query"] = True
             print("✅ Basic query execution successful")
         
-        # Test table creation
+        # Test table creation and data insertion (one multi-statement call)
         conn.execute("""
             CREATE TABLE test_metrics (
                 timestamp TIMESTAMP,
                 metric_name VARCHAR,
                 metric_value DOUBLE,
                 tags MAP(VARCHAR, VARCHAR)
-            )
-        """)
-        results["table_creation"] = True
-        print("✅ Table creation successful")
-        
-        # Test data insertion
-        conn.execute("""
+            );
+            
             INSERT INTO test_metrics VALUES
             (NOW(), 'cpu_usage', 45.5, MAP {'host': 'server1', 'region': 'us-west'}),
             (NOW() - INTERVAL 1 MINUTE, 'cpu_usage', 42.3, MAP {'host': 'server1', 'region': 'us-west'}),
-            (NOW() - INTERVAL 2 MINUTE, 'memory_usage', 78.2, MAP {'host': 'server2', 'region': 'us-east'})
+            (NOW() - INTERVAL 2 MINUTE, 'memory_usage', 78.2, MAP {'host': 'server2', 'region': 'us-east'});
         """)
+        results["table_creation"] = True
+        print("✅ Table creation successful")
         results["data_insertion"] = True
         print("✅ Data insertion successful")
         
         # Test analytical query
         import time
+        import numpy  # noqa: F401 - loaded by fetchnumpy; imported here so it is not timed
         start_time = time.time()
         
-        result = conn.execute("""
+        result = conn.sql("""
             SELECT 
                 metric_name,
                 COUNT(*) as count,
@@ -80,16 +78,18 @@ def test_duckdb_installation():
             FROM test_metrics
             GROUP BY metric_name
             ORDER BY avg_value DESC
-        """).fetchall()
+        """).fetchnumpy()
         
         query_time = (time.time() - start_time) * 1000
         results["analytical_query"] = True
         results["performance"]["analytical_query_ms"] = round(query_time, 2)
         print(f"✅ Analytical query successful ({query_time:.2f}ms)")
         
-        # Test extensions availability
-        extensions = conn.execute("SELECT * FROM duckdb_extensions()").fetchall()
-        available_extensions = [ext[0] for ext in extensions if ext[1]]
+        # Test extensions availability (columnar fetch, filtered in SQL)
+        extensions = conn.execute(
+            "SELECT extension_name FROM duckdb_extensions() WHERE loaded"
+        ).fetchnumpy()
+        available_extensions = extensions["extension_name"].tolist()
         results["available_extensions"] = available_extensions
         print(f"✅ Available extensions: {len(available_extensions)}")
         
@@ -129,8 +129,8 @@ def test_duckdb_installation():
         print("="*60)
         
         # Save results
-        with open('/Users/server/Code/AI-projects/AI-server/services/storage/duckdb/installation_test_results.json', 'w') as f:
-            json.dump(results, f, indent=2)
+        with open('/Users/server/Code/AI-projects/AI-server/services/storage/duckdb/installation_test_results.json', 'wb') as f:
+            f.write(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
         
         return results["status"] == "SUCCESS"
         
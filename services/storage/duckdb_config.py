@@ -5,17 +5,26 @@ DuckDB Configuration and Connection Management
 Handles DuckDB memory limits, connection pooling, and optimization settings.
 """
 
+import atexit
 import os
-import psutil
-import duckdb
+import threading
+import time
+import uuid
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import TYPE_CHECKING, Optional, Dict, Any
+
+# psutil and duckdb are imported where they are used so that importing
+# this module (e.g. for get_memory_info in a health check) stays cheap.
+if TYPE_CHECKING:
+    import duckdb
 
 
 class DuckDBConfig:
     """DuckDB configuration and connection manager."""
     
     def __init__(self, data_dir: str = "services/storage/data/duckdb"):
+        import psutil
+        
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
@@ -24,36 +33,71 @@ class DuckDBConfig:
         self.duckdb_memory_gb = round(self.total_memory_gb * 0.20, 1)
         self.duckdb_memory_setting = f"{self.duckdb_memory_gb}GB"
         
-    def get_connection(self, database_name: str = "analytics") -> duckdb.DuckDBPyConnection:
+        # Physical cores capped at 8, minus 2 reserved for models
+        physical_cores = psutil.cpu_count(logical=False) or 4
+        self.duckdb_threads = max(1, min(physical_cores, 8) - 2)
+        
+        # One open database per file; callers get cheap child cursors
+        self._conns: Dict[str, "duckdb.DuckDBPyConnection"] = {}
+        self._conns_lock = threading.Lock()
+        
+    def get_connection(self, database_name: str = "analytics") -> "duckdb.DuckDBPyConnection":
         """
         Get a DuckDB connection with optimized settings.
         
+        The database is opened once and cached; each call returns a new
+        cursor on it, so closing the result does not close the database.
+        
         Args:
             database_name: Name of the database file
             
         Returns:
             Configured DuckDB connection
         """
-        db_path = self.data_dir / f"{database_name}.db"
-        conn = duckdb.connect(str(db_path))
+        conn = self._conns.get(database_name)
+        if conn is None:
+            with self._conns_lock:
+                conn = self._conns.get(database_name)
+                if conn is None:
+                    conn = self._conns[database_name] = self._open(database_name)
         
-        # Configure memory limits and optimization
-        self._configure_connection(conn)
-        
-        return conn
+        return conn.cursor()
     
-    def _configure_connection(self, conn: duckdb.DuckDBPyConnection) -> None:
-        """Apply configuration settings to a connection."""
-        
-        # Memory configuration (20% of available RAM)
-        conn.execute(f"SET memory_limit='{self.duckdb_memory_setting}'")
+    def _open(self, database_name: str) -> "duckdb.DuckDBPyConnection":
+        """Open the parent connection for a database file with optimized settings."""
+        import duckdb
         
-        # Performance optimizations
-        conn.execute("SET threads=4")  # Limit threads to preserve CPU for models
-        conn.execute("SET temp_directory='/tmp/duckdb'")
-        
-        # Optimization settings  
-        conn.execute("SET preserve_insertion_order=false")  # Better performance
+        db_path = self.data_dir / f"{database_name}.db"
+        return duckdb.connect(str(db_path), config=self._connection_config())
+    
+    def close_connection(self, database_name: str) -> None:
+        """Close the cached connection to one database, releasing its file lock."""
+        with self._conns_lock:
+            conn = self._conns.pop(database_name, None)
+        if conn is not None:
+            conn.close()
+    
+    def close_all(self) -> None:
+        """Close all cached database connections."""
+        with self._conns_lock:
+            for conn in self._conns.values():
+                conn.close()
+            self._conns.clear()
+    
+    def _connection_config(self) -> Dict[str, str]:
+        """Settings applied by duckdb.connect() at open time."""
+        return {
+            # Memory configuration (20% of available RAM)
+            "memory_limit": self.duckdb_memory_setting,
+            
+            # Performance optimizations
+            "threads": str(self.duckdb_threads),  # Preserve CPU for models
+            "temp_directory": "/tmp/duckdb",
+            
+            # Optimization settings
+            "preserve_insertion_order": "false",  # Better performance
+            "enable_object_cache": "true",  # Reuse Parquet metadata across queries
+        }
         
     def create_temp_directory(self) -> None:
         """Create temporary directory for DuckDB spill operations."""
@@ -66,15 +110,48 @@ class DuckDBConfig:
             "total_system_memory_gb": self.total_memory_gb,
             "duckdb_memory_limit_gb": self.duckdb_memory_gb,
             "duckdb_memory_setting": self.duckdb_memory_setting,
-            "memory_percentage": 20.0
+            "memory_percentage": 20.0,
+            "duckdb_threads": self.duckdb_threads
         }
 
 
-# Global configuration instance
-duckdb_config = DuckDBConfig()
+def uuid7() -> uuid.UUID:
+    """
+    Generate a time-ordered UUID (RFC 9562 version 7).
+    
+    Tables take their primary keys from here instead of gen_random_uuid():
+    the 48-bit millisecond timestamp prefix keeps inserts appending to the
+    right edge of the primary-key index.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(os.urandom(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+# Global configuration instance, created on first use
+_duckdb_config: Optional[DuckDBConfig] = None
+_duckdb_config_lock = threading.Lock()
+
 
+def get_duckdb_config() -> DuckDBConfig:
+    """Get the global DuckDB configuration instance."""
+    global _duckdb_config
+    if _duckdb_config is None:
+        with _duckdb_config_lock:
+            if _duckdb_config is None:
+                _duckdb_config = DuckDBConfig()
+    return _duckdb_config
 
-def get_duckdb_connection(database_name: str = "analytics") -> duckdb.DuckDBPyConnection:
+
+def __getattr__(name: str) -> Any:
+    # Keep `from duckdb_config import duckdb_config` working
+    if name == "duckdb_config":
+        return get_duckdb_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def get_duckdb_connection(database_name: str = "analytics") -> "duckdb.DuckDBPyConnection":
     """
     Convenience function to get a configured DuckDB connection.
     
@@ -84,7 +161,17 @@ def get_duckdb_connection(database_name: str = "analytics") -> duckdb.DuckDBPyCo
     Returns:
         Configured DuckDB connection
     """
-    return duckdb_config.get_connection(database_name)
+    return get_duckdb_config().get_connection(database_name)
+
+
+def close_duckdb_connections() -> None:
+    """Close every cached connection of the global configuration, if created."""
+    if _duckdb_config is not None:
+        _duckdb_config.close_all()
+
+
+# Cached connections hold each database's file lock until closed
+atexit.register(close_duckdb_connections)
 
 
 if __name__ == "__main__":
@@ -101,4 +188,5 @@ if __name__ == "__main__":
     conn = config.get_connection("test")
     result = conn.execute("SELECT 'DuckDB configuration test successful' as message").fetchone()
     print(f"\nTest result: {result[0]}")
-    conn.close()
\ No newline at end of file
+    conn.close()
+    config.close_all()
\ No newline at end of file
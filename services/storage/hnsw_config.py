@@ -6,8 +6,61 @@ Configures HNSW (Hierarchical Navigable Small World) index parameters for optima
 vector search performance with accuracy/speed trade-offs.
 """
 
-from typing import Dict, Any
-from qdrant_client.models import HnswConfigDiff
+import functools
+import math
+from types import MappingProxyType
+from typing import Dict, Any, Literal, Mapping, Optional, Union
+
+import numpy as np
+from qdrant_client.models import (
+    CompressionRatio,
+    HnswConfigDiff,
+    ProductQuantization,
+    ProductQuantizationConfig,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+)
+
+Quantization = Literal["none", "sq8", "sq4", "pq"]
+
+# Fields returned by HnswConfig.estimate_memory_usage(_batch)
+MEMORY_ESTIMATE_DTYPE = np.dtype([
+    ("bytes_per_vector", np.float64),
+    ("vectors_mb", np.float64),
+    ("quantization_overhead_mb", np.float64),
+    ("layer0_graph_mb", np.float64),
+    ("upper_graph_mb", np.float64),
+    ("graph_mb", np.float64),
+    ("metadata_mb", np.float64),
+    ("total_mb", np.float64),
+    ("total_gb", np.float64),
+])
+
+
+@functools.lru_cache(maxsize=64)
+def _build_hnsw_config(m: int,
+                       ef_construct: int,
+                       max_indexing_threads: int,
+                       full_scan_threshold: int,
+                       on_disk: bool) -> HnswConfigDiff:
+    """Build (once per parameter tuple) the HnswConfigDiff for resolved parameters."""
+    return HnswConfigDiff(
+        m=m,
+        ef_construct=ef_construct,
+        max_indexing_threads=max_indexing_threads,
+        full_scan_threshold=full_scan_threshold,
+        on_disk=on_disk
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _build_search_params(ef: int) -> Mapping[str, Any]:
+    """Build (once per ef) read-only search parameters."""
+    return MappingProxyType({
+        "hnsw_ef": ef,
+        "exact": False  # Use HNSW approximation for speed
+    })
 
 
 class HnswConfig:
@@ -19,16 +72,32 @@ class HnswConfig:
         "ef_construct": 100,  # Index quality - size of dynamic candidate list
         "ef": 50,             # Search quality - size of dynamic candidate list during search
         "max_indexing_threads": 4,  # Limit threads for model compatibility
-        "full_scan_threshold": 10000  # Use full scan for small collections
+        "full_scan_threshold": 10000,  # Use full scan for small collections
+        "on_disk": False      # Keep the graph in RAM (True = mmap from disk)
     }
     
+    # Stored bytes per vector dimension for each quantization mode
+    QUANTIZATION_BYTES_PER_DIM = {
+        "none": 4.0,       # float32
+        "sq8": 1.0,        # int8 scalar quantization
+        "sq4": 0.5,        # 4-bit scalar quantization (estimate only, not in Qdrant)
+        "pq": 4.0 / 16     # product quantization at Qdrant's x16 compression
+    }
+    
+    # Adaptive ef: bounds, and per-collection EMA of observed p95 search latency
+    ADAPTIVE_EF_MIN = 16
+    ADAPTIVE_EF_MAX = 256
+    P95_EMA_ALPHA = 0.2
+    _p95_ema_ms: Dict[str, float] = {}
+    
     @classmethod
     def get_hnsw_config(cls, 
                        m: int = None,
                        ef_construct: int = None, 
                        ef: int = None,
                        max_indexing_threads: int = None,
-                       full_scan_threshold: int = None) -> HnswConfigDiff:
+                       full_scan_threshold: int = None,
+                       on_disk: bool = None) -> HnswConfigDiff:
         """
         Get HNSW configuration with custom or default parameters.
         
@@ -44,49 +113,110 @@ class HnswConfig:
                - Lower values = faster search, potentially lower accuracy
             max_indexing_threads: Maximum threads for indexing (default: 4)
             full_scan_threshold: Use brute force for collections smaller than this (default: 10000)
+            on_disk: Store the HNSW graph on disk via mmap instead of RAM (default: False)
         
         Returns:
-            HnswConfigDiff object for Qdrant collection creation
+            HnswConfigDiff object for Qdrant collection creation (a copy of
+            the cached object, safe for the caller to modify)
+        """
+        
+        # Resolve defaults, then copy the one cached object per parameter tuple
+        # (ef is a search-time parameter and not part of HnswConfigDiff)
+        defaults = cls.DEFAULT_PARAMS
+        return _build_hnsw_config(
+            defaults["m"] if m is None else m,
+            defaults["ef_construct"] if ef_construct is None else ef_construct,
+            defaults["max_indexing_threads"] if max_indexing_threads is None else max_indexing_threads,
+            defaults["full_scan_threshold"] if full_scan_threshold is None else full_scan_threshold,
+            defaults["on_disk"] if on_disk is None else on_disk
+        ).model_copy()
+    
+    @classmethod
+    def get_quantization_config(cls,
+                                quantization: Quantization = "sq8",
+                                quantile: float = 0.99,
+                                always_ram: bool = True) -> Optional[Union[ScalarQuantization, ProductQuantization]]:
         """
+        Get Qdrant quantization configuration to pass alongside the HNSW config.
         
-        params = cls.DEFAULT_PARAMS.copy()
-        
-        # Override with custom parameters if provided
-        if m is not None:
-            params["m"] = m
-        if ef_construct is not None:
-            params["ef_construct"] = ef_construct
-        if ef is not None:
-            params["ef"] = ef
-        if max_indexing_threads is not None:
-            params["max_indexing_threads"] = max_indexing_threads
-        if full_scan_threshold is not None:
-            params["full_scan_threshold"] = full_scan_threshold
+        Args:
+            quantization: One of 'none', 'sq8', 'pq'
+            quantile: Quantile used to compute the int8 range (sq8 only)
+            always_ram: Keep quantized vectors in RAM for search
             
-        return HnswConfigDiff(
-            m=params["m"],
-            ef_construct=params["ef_construct"],
-            max_indexing_threads=params["max_indexing_threads"],
-            full_scan_threshold=params["full_scan_threshold"]
-        )
+        Returns:
+            Quantization config for collection creation, or None for 'none'
+        """
+        if quantization == "none":
+            return None
+        if quantization == "sq8":
+            return ScalarQuantization(
+                scalar=ScalarQuantizationConfig(
+                    type=ScalarType.INT8,
+                    quantile=quantile,
+                    always_ram=always_ram
+                )
+            )
+        if quantization == "pq":
+            return ProductQuantization(
+                product=ProductQuantizationConfig(
+                    compression=CompressionRatio.X16,
+                    always_ram=always_ram
+                )
+            )
+        raise ValueError(f"Unsupported quantization for Qdrant: {quantization}")
+    
+    @classmethod
+    def record_search_latency(cls, collection: str, p95_ms: float) -> float:
+        """
+        Fold an observed p95 search latency into the collection's EMA.
+        
+        Returns:
+            Updated p95 EMA in milliseconds
+        """
+        previous = cls._p95_ema_ms.get(collection)
+        ema = p95_ms if previous is None else previous + cls.P95_EMA_ALPHA * (p95_ms - previous)
+        cls._p95_ema_ms[collection] = ema
+        return ema
     
     @classmethod
-    def get_search_params(cls, ef: int = None) -> Dict[str, Any]:
+    def get_search_params(cls,
+                          ef: int = None,
+                          budget_ms: float = None,
+                          observed_p95_ms: float = None,
+                          collection: str = None) -> Mapping[str, Any]:
         """
         Get search parameters for query operations.
         
+        With a latency budget, ef is scaled by budget / p95 and clamped to
+        [ADAPTIVE_EF_MIN, ADAPTIVE_EF_MAX]: raised while searches finish under
+        budget, lowered under overload.
+        
         Args:
-            ef: Size of dynamic candidate list during search
+            ef: Size of dynamic candidate list during search (current operating point)
+            budget_ms: Target search latency in milliseconds
+            observed_p95_ms: Latest observed p95 search latency in milliseconds
+            collection: Collection whose p95 EMA is updated/used instead of the raw value
             
         Returns:
-            Search parameters dictionary
+            Search parameters (read-only, shared between callers)
         """
         search_ef = ef if ef is not None else cls.DEFAULT_PARAMS["ef"]
         
-        return {
-            "hnsw_ef": search_ef,
-            "exact": False  # Use HNSW approximation for speed
-        }
+        if budget_ms is not None:
+            if collection is not None:
+                if observed_p95_ms is not None:
+                    observed_p95_ms = cls.record_search_latency(collection, observed_p95_ms)
+                else:
+                    observed_p95_ms = cls._p95_ema_ms.get(collection)
+            
+            if observed_p95_ms is not None:
+                search_ef = max(
+                    cls.ADAPTIVE_EF_MIN,
+                    min(cls.ADAPTIVE_EF_MAX, int(search_ef * budget_ms / max(observed_p95_ms, 1)))
+                )
+        
+        return _build_search_params(search_ef)
     
     @classmethod
     def get_config_presets(cls) -> Dict[str, Dict[str, Any]]:
@@ -101,6 +231,9 @@ class HnswConfig:
                 "m": 32,
                 "ef_construct": 200,
                 "ef": 128,
+                "quantization": "none",
+                "on_disk": False,
+                "on_disk_payload": False,  # create_collection() option, not HnswConfigDiff
                 "description": "Maximum accuracy, slower search"
             },
             
@@ -108,6 +241,9 @@ class HnswConfig:
                 "m": 16,
                 "ef_construct": 100,
                 "ef": 50,
+                "quantization": "none",
+                "on_disk": False,
+                "on_disk_payload": False,
                 "description": "Balanced accuracy/speed (default)"
             },
             
@@ -115,6 +251,9 @@ class HnswConfig:
                 "m": 8,
                 "ef_construct": 64,
                 "ef": 16,
+                "quantization": "none",
+                "on_disk": False,
+                "on_disk_payload": False,
                 "description": "Maximum speed, lower accuracy"
             },
             
@@ -122,6 +261,9 @@ class HnswConfig:
                 "m": 8,
                 "ef_construct": 80,
                 "ef": 32,
+                "quantization": "sq8",
+                "on_disk": True,
+                "on_disk_payload": True,
                 "description": "Lower memory usage"
             },
             
@@ -129,6 +271,10 @@ class HnswConfig:
                 "m": 24,
                 "ef_construct": 128,
                 "ef": 64,
+                "quantization": "none",
+                "on_disk": True,
+                "on_disk_payload": True,
+                "max_indexing_threads": 0,  # Unlimited indexing threads for bulk builds
                 "description": "Optimized for large collections (>1M vectors)"
             }
         }
@@ -137,7 +283,8 @@ class HnswConfig:
     def estimate_memory_usage(cls, 
                             num_vectors: int,
                             vector_dimension: int,
-                            m: int = None) -> Dict[str, float]:
+                            m: int = None,
+                            quantization: Quantization = "none") -> Dict[str, float]:
         """
         Estimate memory usage for HNSW index.
         
@@ -145,81 +292,158 @@ class HnswConfig:
             num_vectors: Number of vectors in collection
             vector_dimension: Dimension of vectors
             m: HNSW connectivity parameter
+            quantization: Vector storage mode ('none', 'sq8', 'sq4', 'pq')
             
         Returns:
             Memory usage estimates in MB
         """
         m = m or cls.DEFAULT_PARAMS["m"]
         
+        estimate = cls.estimate_memory_usage_batch(
+            np.array([num_vectors]), np.array([vector_dimension]), np.array([m]), quantization
+        )[0]
+        return {name: float(estimate[name]) for name in MEMORY_ESTIMATE_DTYPE.names}
+    
+    @classmethod
+    def estimate_memory_usage_batch(cls,
+                                    num_vectors: np.ndarray,
+                                    vector_dimension: np.ndarray,
+                                    m: Optional[np.ndarray] = None,
+                                    quantization: Quantization = "none") -> np.ndarray:
+        """
+        Estimate memory usage for many (num_vectors, dimension, m) combinations at once.
+        
+        Args:
+            num_vectors: Array of vector counts
+            vector_dimension: Array of vector dimensions
+            m: Array of HNSW connectivity parameters (default: DEFAULT_PARAMS["m"])
+            quantization: Vector storage mode applied to every combination
+            
+        Returns:
+            Structured array (MEMORY_ESTIMATE_DTYPE) of estimates in MB, one
+            entry per broadcast input element
+        """
+        if m is None:
+            m = cls.DEFAULT_PARAMS["m"]
+        num_vectors, vector_dimension, m = np.broadcast_arrays(
+            np.asarray(num_vectors, dtype=np.float64),
+            np.asarray(vector_dimension, dtype=np.float64),
+            np.asarray(m, dtype=np.float64)
+        )
+        
         # Approximate memory calculations
-        vector_memory_mb = (num_vectors * vector_dimension * 4) / (1024 * 1024)  # 4 bytes per float
+        bytes_per_vector = vector_dimension * cls.QUANTIZATION_BYTES_PER_DIM[quantization]
+        vector_memory_mb = num_vectors * bytes_per_vector / (1024 * 1024)
         
-        # HNSW graph memory (approximate)
-        avg_connections = m * 1.5  # Account for layer 0 having more connections
-        graph_memory_mb = (num_vectors * avg_connections * 8) / (1024 * 1024)  # 8 bytes per connection
+        # PQ codebooks: 256 centroids per subspace, float32, covering all dimensions
+        if quantization == "pq":
+            quantization_overhead_mb = 256 * vector_dimension * 4 / (1024 * 1024)
+        else:
+            quantization_overhead_mb = np.zeros_like(vector_dimension)
+        
+        # HNSW graph memory: layer 0 keeps up to 2*m links per node; upper
+        # layers hold geometrically fewer nodes (~N/ln(m) in total) with m links
+        edge_bytes = np.where(num_vectors < 2**32, 4, 8)  # uint32 ids unless N >= 2^32
+        layer0_graph_mb = num_vectors * 2 * m * edge_bytes / (1024 * 1024)
+        upper_graph_mb = num_vectors * m / np.log(np.maximum(m, 2)) * edge_bytes / (1024 * 1024)
+        graph_memory_mb = layer0_graph_mb + upper_graph_mb
         
         # Metadata and overhead
         metadata_memory_mb = num_vectors * 0.1 / 1024  # ~100 bytes per vector
         
-        total_memory_mb = vector_memory_mb + graph_memory_mb + metadata_memory_mb
+        total_memory_mb = (
+            vector_memory_mb + quantization_overhead_mb + graph_memory_mb + metadata_memory_mb
+        )
         
-        return {
-            "vectors_mb": round(vector_memory_mb, 2),
-            "graph_mb": round(graph_memory_mb, 2),
-            "metadata_mb": round(metadata_memory_mb, 2),
-            "total_mb": round(total_memory_mb, 2),
-            "total_gb": round(total_memory_mb / 1024, 2)
-        }
+        estimates = np.empty(num_vectors.shape, dtype=MEMORY_ESTIMATE_DTYPE)
+        estimates["bytes_per_vector"] = bytes_per_vector
+        estimates["vectors_mb"] = np.round(vector_memory_mb, 2)
+        estimates["quantization_overhead_mb"] = np.round(quantization_overhead_mb, 2)
+        estimates["layer0_graph_mb"] = np.round(layer0_graph_mb, 2)
+        estimates["upper_graph_mb"] = np.round(upper_graph_mb, 2)
+        estimates["graph_mb"] = np.round(graph_memory_mb, 2)
+        estimates["metadata_mb"] = np.round(metadata_memory_mb, 2)
+        estimates["total_mb"] = np.round(total_memory_mb, 2)
+        estimates["total_gb"] = np.round(total_memory_mb / 1024, 2)
+        return estimates
+
+
+# Per-use-case HNSW parameters
+_USE_CASE_CONFIGS = {
+    "code": {
+        "m": 20,           # Higher connectivity for code similarity
+        "ef_construct": 120,
+        "ef": 60,
+        "description": "Optimized for code embedding similarity"
+    },
+    
+    "documents": {
+        "m": 16,           # Balanced for document retrieval
+        "ef_construct": 100,
+        "ef": 50,
+        "description": "Optimized for document embedding similarity"  
+    },
+    
+    "summaries": {
+        "m": 12,           # Lower connectivity for summary embeddings
+        "ef_construct": 80,
+        "ef": 40,
+        "description": "Optimized for summary embedding similarity"
+    },
+    
+    "embeddings": {
+        "m": 24,           # High connectivity for general embeddings
+        "ef_construct": 150,
+        "ef": 75,
+        "description": "Optimized for general purpose embeddings"
+    }
+}
+
+# Embedding dimension the per-use-case parameters above were tuned for
+_REFERENCE_DIM = 768
+
+# HnswConfigDiff objects for each use case at the reference dimension, built once at import
+_USE_CASE_HNSW = {
+    name: HnswConfig.get_hnsw_config(
+        m=config["m"],
+        ef_construct=config["ef_construct"],
+        ef=config["ef"]
+    )
+    for name, config in _USE_CASE_CONFIGS.items()
+}
+_DEFAULT_HNSW = HnswConfig.get_hnsw_config()
+
+
+@functools.lru_cache(maxsize=64)
+def _dim_scaled_config(use_case: str, dim: int) -> HnswConfigDiff:
+    """
+    Scale a use case's tuned parameters to another embedding dimension.
+    
+    Optimal connectivity grows roughly with log2(dim), so m is scaled by
+    log2(dim) / log2(_REFERENCE_DIM) and clamped to [8, 48]; ef_construct
+    keeps its ratio to m with a floor of 64.
+    """
+    config = _USE_CASE_CONFIGS.get(use_case, HnswConfig.DEFAULT_PARAMS)
+    scale = math.log2(max(dim, 2)) / math.log2(_REFERENCE_DIM)
+    m = min(48, max(8, round(config["m"] * scale)))
+    ef_construct = max(64, round(config["ef_construct"] * m / config["m"]))
+    return HnswConfig.get_hnsw_config(m=m, ef_construct=ef_construct, ef=config["ef"])
 
 
-def get_optimized_config_for_use_case(use_case: str) -> HnswConfigDiff:
+def get_optimized_config_for_use_case(use_case: str, dim: int = _REFERENCE_DIM) -> HnswConfigDiff:
     """
     Get optimized HNSW configuration for specific AI-Server use cases.
     
     Args:
         use_case: One of 'code', 'documents', 'summaries', 'embeddings'
+        dim: Embedding dimension of the collection (default: 768)
         
     Returns:
-        Optimized HnswConfigDiff for the use case
+        Optimized HnswConfigDiff for the use case (a copy, safe to modify)
     """
-    
-    use_case_configs = {
-        "code": {
-            "m": 20,           # Higher connectivity for code similarity
-            "ef_construct": 120,
-            "ef": 60,
-            "description": "Optimized for code embedding similarity"
-        },
-        
-        "documents": {
-            "m": 16,           # Balanced for document retrieval
-            "ef_construct": 100,
-            "ef": 50,
-            "description": "Optimized for document embedding similarity"  
-        },
-        
-        "summaries": {
-            "m": 12,           # Lower connectivity for summary embeddings
-            "ef_construct": 80,
-            "ef": 40,
-            "description": "Optimized for summary embedding similarity"
-        },
-        
-        "embeddings": {
-            "m": 24,           # High connectivity for general embeddings
-            "ef_construct": 150,
-            "ef": 75,
-            "description": "Optimized for general purpose embeddings"
-        }
-    }
-    
-    config = use_case_configs.get(use_case, HnswConfig.DEFAULT_PARAMS)
-    
-    return HnswConfig.get_hnsw_config(
-        m=config.get("m"),
-        ef_construct=config.get("ef_construct"),
-        ef=config.get("ef")
-    )
+    if dim == _REFERENCE_DIM:
+        return _USE_CASE_HNSW.get(use_case, _DEFAULT_HNSW).model_copy()
+    return _dim_scaled_config(use_case, dim).model_copy()
 
 
 if __name__ == "__main__":
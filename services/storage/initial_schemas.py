@@ -6,17 +6,185 @@ Creates and manages the initial database schemas for the AI-Server system.
 """
 
 import duckdb
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from duckdb_config import get_duckdb_connection
+from typing import Callable, Dict, List, Tuple, Union
+from duckdb_config import close_duckdb_connections, get_duckdb_connection, uuid7
 from partitioning_templates import PartitioningTemplates, SCHEMA_TEMPLATES
 
 
+# Width of retrieval_cache embeddings (one embedder per cache table)
+CACHE_EMBEDDING_DIM = 768
+
+# DDL and statements are built once at import; methods execute these constants
+_DDL_HIERARCHY_RELATIONSHIPS = """
+    CREATE TABLE IF NOT EXISTS hierarchy_relationships (
+        id UUID PRIMARY KEY,  -- uuid7() bound by the caller
+        parent_id UUID NOT NULL,
+        child_id UUID NOT NULL,
+        relationship_type VARCHAR(50) NOT NULL,
+        strength DOUBLE DEFAULT 1.0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(parent_id, child_id, relationship_type)
+    );
+    
+    -- Create indexes for performance
+    CREATE INDEX IF NOT EXISTS idx_hierarchy_parent 
+    ON hierarchy_relationships (parent_id);
+    
+    CREATE INDEX IF NOT EXISTS idx_hierarchy_child 
+    ON hierarchy_relationships (child_id)
+"""
+
+_DDL_PERFORMANCE_AGGREGATES = """
+    CREATE TABLE IF NOT EXISTS performance_aggregates (
+        id UUID PRIMARY KEY,  -- uuid7() bound by the caller
+        metric_name VARCHAR(100) NOT NULL,
+        aggregation_type VARCHAR(20) NOT NULL, -- 'hourly', 'daily', 'weekly'
+        time_period TIMESTAMP NOT NULL,
+        min_value DOUBLE,
+        max_value DOUBLE,
+        avg_value DOUBLE,
+        sum_value DOUBLE,
+        count_value INTEGER,
+        percentile_50 DOUBLE,
+        percentile_95 DOUBLE,
+        percentile_99 DOUBLE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(metric_name, aggregation_type, time_period)
+    );
+    
+    -- Create index on time_period for efficient queries
+    CREATE INDEX IF NOT EXISTS idx_perf_time_period 
+    ON performance_aggregates (time_period)
+"""
+
+_DDL_ERROR_TRACKING = """
+    CREATE TABLE IF NOT EXISTS error_tracking (
+        id UUID PRIMARY KEY,  -- uuid7() bound by the caller
+        error_hash VARCHAR(32) NOT NULL, -- content_hash() of error message + stack trace
+        error_type VARCHAR(100) NOT NULL,
+        error_message TEXT NOT NULL,
+        stack_trace TEXT,
+        first_occurrence TIMESTAMP NOT NULL,
+        last_occurrence TIMESTAMP NOT NULL,
+        occurrence_count INTEGER DEFAULT 1,
+        severity VARCHAR(20) NOT NULL,
+        status VARCHAR(20) DEFAULT 'open', -- 'open', 'resolved', 'ignored'
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(error_hash)
+    );
+    
+    -- Index for error tracking queries
+    CREATE INDEX IF NOT EXISTS idx_error_status 
+    ON error_tracking (status, last_occurrence)
+"""
+
+_DDL_RETRIEVAL_CACHE = f"""
+    CREATE TABLE IF NOT EXISTS retrieval_cache (
+        id UUID PRIMARY KEY,  -- uuid7() bound by the caller
+        query_hash VARCHAR(32) NOT NULL, -- content_hash() of the query
+        query_embedding FLOAT[{CACHE_EMBEDDING_DIM}],  -- Fixed-size float32, required by the vss HNSW index
+        retrieved_document_ids UUID[],
+        confidence_scores FLOAT[],
+        cache_hit_count INTEGER DEFAULT 1,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(query_hash)
+    );
+    
+    -- Cache lookups use the UNIQUE(query_hash) index; drop the old duplicate
+    DROP INDEX IF EXISTS idx_retrieval_query_hash
+"""
+
+_DDL_SYSTEM_TABLES = """
+    CREATE TABLE IF NOT EXISTS schema_versions (
+        id UUID PRIMARY KEY,  -- uuid7() bound by the caller
+        schema_name VARCHAR(100) NOT NULL,
+        version VARCHAR(20) NOT NULL,
+        migration_script TEXT,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        rollback_script TEXT,
+        UNIQUE(schema_name, version)
+    );
+    
+    -- Configuration storage
+    CREATE TABLE IF NOT EXISTS system_configuration (
+        id UUID PRIMARY KEY,  -- uuid7() bound by the caller
+        config_key VARCHAR(200) NOT NULL,
+        config_value TEXT NOT NULL,
+        config_type VARCHAR(20) DEFAULT 'string', -- 'string', 'json', 'number', 'boolean'
+        description TEXT,
+        is_sensitive BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        UNIQUE(config_key)
+    );
+    
+    -- Configuration lookups use the UNIQUE(config_key) index; drop the old duplicate
+    DROP INDEX IF EXISTS idx_config_key
+"""
+
+# ANN index for semantic cache lookups (parameters match HnswConfig.DEFAULT_PARAMS)
+_DDL_CACHE_EMBEDDING_INDEX = """
+    CREATE INDEX IF NOT EXISTS idx_cache_embedding
+    ON retrieval_cache USING HNSW (query_embedding)
+    WITH (metric = 'cosine', M = 16, ef_construction = 100)
+"""
+
+_SQL_LOAD_VSS = """
+    INSTALL vss;
+    LOAD vss;
+    SET hnsw_enable_experimental_persistence = true;
+"""
+
+_SQL_EXTENSION_LOADED = "SELECT loaded FROM duckdb_extensions() WHERE extension_name = ?"
+
+_SQL_COLUMN_TYPE = """
+    SELECT data_type FROM information_schema.columns
+    WHERE table_schema = current_schema() AND table_name = ? AND column_name = ?
+"""
+
+# Databases created before the FLOAT[N] column keep query_embedding DOUBLE[]
+_CACHE_EMBEDDING_TYPE = f"FLOAT[{CACHE_EMBEDDING_DIM}]"
+
+_SQL_RECORD_SCHEMA_VERSION = """
+    INSERT INTO schema_versions 
+    (id, schema_name, version, applied_at) 
+    VALUES (?, ?, '1.0.0', CURRENT_TIMESTAMP)
+    ON CONFLICT (schema_name, version) DO NOTHING
+"""
+
+
+def content_hash(payload: Union[str, bytes]) -> str:
+    """
+    Hash a payload for the query_hash / error_hash dedup columns.
+    
+    128-bit BLAKE2b (32 hex chars): non-cryptographic use, faster than
+    SHA-256 and available in the standard library.
+    """
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
 class SchemaManager:
     """Manages DuckDB schema creation and versioning."""
     
     def __init__(self, data_dir: str = "services/storage/data/duckdb"):
         self.data_dir = Path(data_dir)
         self.templates = PartitioningTemplates()
+        
+        # Schema creation method per database type
+        self._schema_creators: Dict[str, Callable[[duckdb.DuckDBPyConnection], None]] = {
+            "hierarchy": self.create_hierarchy_schemas,
+            "metrics": self.create_metrics_schemas,
+            "logs": self.create_logging_schemas,
+            "rag": self.create_rag_schemas,
+            "system": self.create_system_schemas
+        }
     
     def create_hierarchy_schemas(self, conn: duckdb.DuckDBPyConnection) -> None:
         """Create schemas for memory hierarchy storage."""
@@ -37,28 +205,7 @@ class SchemaManager:
         )
         
         # Hierarchy relationships table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS hierarchy_relationships (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                parent_id UUID NOT NULL,
-                child_id UUID NOT NULL,
-                relationship_type VARCHAR(50) NOT NULL,
-                strength DOUBLE DEFAULT 1.0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(parent_id, child_id, relationship_type)
-            )
-        """)
-        
-        # Create indexes for performance
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_hierarchy_parent 
-            ON hierarchy_relationships (parent_id)
-        """)
-        
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_hierarchy_child 
-            ON hierarchy_relationships (child_id)
-        """)
+        conn.execute(_DDL_HIERARCHY_RELATIONSHIPS)
     
     def create_metrics_schemas(self, conn: duckdb.DuckDBPyConnection) -> None:
         """Create schemas for system metrics storage."""
@@ -69,30 +216,7 @@ class SchemaManager:
         )
         
         # Performance metrics aggregation table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS performance_aggregates (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                metric_name VARCHAR(100) NOT NULL,
-                aggregation_type VARCHAR(20) NOT NULL, -- 'hourly', 'daily', 'weekly'
-                time_period TIMESTAMP NOT NULL,
-                min_value DOUBLE,
-                max_value DOUBLE,
-                avg_value DOUBLE,
-                sum_value DOUBLE,
-                count_value INTEGER,
-                percentile_50 DOUBLE,
-                percentile_95 DOUBLE,
-                percentile_99 DOUBLE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(metric_name, aggregation_type, time_period)
-            )
-        """)
-        
-        # Create index on time_period for efficient queries
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_perf_time_period 
-            ON performance_aggregates (time_period)
-        """)
+        conn.execute(_DDL_PERFORMANCE_AGGREGATES)
     
     def create_logging_schemas(self, conn: duckdb.DuckDBPyConnection) -> None:
         """Create schemas for application logging."""
@@ -103,29 +227,7 @@ class SchemaManager:
         )
         
         # Error tracking table for monitoring
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS error_tracking (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                error_hash VARCHAR(64) NOT NULL, -- Hash of error message + stack trace
-                error_type VARCHAR(100) NOT NULL,
-                error_message TEXT NOT NULL,
-                stack_trace TEXT,
-                first_occurrence TIMESTAMP NOT NULL,
-                last_occurrence TIMESTAMP NOT NULL,
-                occurrence_count INTEGER DEFAULT 1,
-                severity VARCHAR(20) NOT NULL,
-                status VARCHAR(20) DEFAULT 'open', -- 'open', 'resolved', 'ignored'
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(error_hash)
-            )
-        """)
-        
-        # Index for error tracking queries
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_error_status 
-            ON error_tracking (status, last_occurrence)
-        """)
+        conn.execute(_DDL_ERROR_TRACKING)
     
     def create_rag_schemas(self, conn: duckdb.DuckDBPyConnection) -> None:
         """Create schemas for RAG (Retrieval Augmented Generation) events."""
@@ -136,62 +238,90 @@ class SchemaManager:
         )
         
         # Document retrieval cache
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS retrieval_cache (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                query_hash VARCHAR(64) NOT NULL,
-                query_embedding DOUBLE[],  -- Store embedding for similarity search
-                retrieved_document_ids UUID[],
-                confidence_scores DOUBLE[],
-                cache_hit_count INTEGER DEFAULT 1,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                last_accessed TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(query_hash)
-            )
-        """)
+        conn.execute(_DDL_RETRIEVAL_CACHE)
+        
+        # ANN index for semantic cache lookups (HNSW rejects a legacy DOUBLE[] column)
+        if self._extension_loaded(conn, "vss") and self._cache_embedding_indexable(conn):
+            conn.execute(_DDL_CACHE_EMBEDDING_INDEX)
+    
+    def load_vss_extension(self, conn: duckdb.DuckDBPyConnection) -> bool:
+        """
+        Install and load the DuckDB vss extension for HNSW indexes.
         
-        # Index for cache lookups
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_retrieval_query_hash 
-            ON retrieval_cache (query_hash)
-        """)
+        Must run outside a transaction: a failed INSTALL/LOAD aborts it.
+        
+        Returns:
+            True if the extension is loaded
+        """
+        try:
+            conn.execute(_SQL_LOAD_VSS)
+            return True
+        except duckdb.Error:
+            return False
+    
+    @staticmethod
+    def _extension_loaded(conn: duckdb.DuckDBPyConnection, name: str) -> bool:
+        """Check whether a DuckDB extension is loaded."""
+        row = conn.execute(_SQL_EXTENSION_LOADED, [name]).fetchone()
+        return bool(row and row[0])
+    
+    @staticmethod
+    def _cache_embedding_indexable(conn: duckdb.DuckDBPyConnection) -> bool:
+        """Check that retrieval_cache.query_embedding has the fixed-size type HNSW needs."""
+        row = conn.execute(_SQL_COLUMN_TYPE, ["retrieval_cache", "query_embedding"]).fetchone()
+        return bool(row) and row[0] == _CACHE_EMBEDDING_TYPE
     
     def create_system_schemas(self, conn: duckdb.DuckDBPyConnection) -> None:
         """Create system-level schemas."""
         
-        # Schema versioning table
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS schema_versions (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                schema_name VARCHAR(100) NOT NULL,
-                version VARCHAR(20) NOT NULL,
-                migration_script TEXT,
-                applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                rollback_script TEXT,
-                UNIQUE(schema_name, version)
-            )
-        """)
+        # Schema versioning and configuration storage tables
+        conn.execute(_DDL_SYSTEM_TABLES)
+        
+        # Record schema version
+        conn.execute(_SQL_RECORD_SCHEMA_VERSION, [uuid7(), "system"])
+    
+    def _init_one(self, database: Tuple[str, str]) -> List[str]:
+        """
+        Create the schemas of one database.
+        
+        Args:
+            database: (db_type, db_name) pair
+            
+        Returns:
+            Progress messages, printed by the caller once all databases finish
+        """
+        db_type, db_name = database
+        messages = [f"Creating {db_type} schemas in {db_name}.db..."]
         
-        # Configuration storage
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS system_configuration (
-                id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                config_key VARCHAR(200) NOT NULL,
-                config_value TEXT NOT NULL,
-                config_type VARCHAR(20) DEFAULT 'string', -- 'string', 'json', 'number', 'boolean'
-                description TEXT,
-                is_sensitive BOOLEAN DEFAULT FALSE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                UNIQUE(config_key)
-            )
-        """)
+        conn = get_duckdb_connection(db_name)
         
-        # Index for configuration lookups
-        conn.execute("""
-            CREATE INDEX IF NOT EXISTS idx_config_key 
-            ON system_configuration (config_key)
-        """)
+        try:
+            # Extensions load before the DDL transaction (a failed LOAD aborts it)
+            if db_type == "rag" and not self.load_vss_extension(conn):
+                messages.append("⚠️ vss extension unavailable; retrieval_cache embeddings stay unindexed")
+            
+            # One transaction per database: a single commit for all DDL
+            conn.begin()
+            
+            self._schema_creators[db_type](conn)
+            
+            if (db_type == "rag" and self._extension_loaded(conn, "vss")
+                    and not self._cache_embedding_indexable(conn)):
+                messages.append(
+                    f"⚠️ retrieval_cache.query_embedding is not {_CACHE_EMBEDDING_TYPE}; "
+                    "HNSW index skipped (recreate the table to enable it)"
+                )
+            
+            conn.commit()
+            messages.append(f"✓ {db_type} schemas created successfully")
+            
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+        
+        return messages
     
     def initialize_all_schemas(self) -> None:
         """Initialize all database schemas."""
@@ -207,36 +337,13 @@ class SchemaManager:
             "system": "system_data"
         }
         
-        for db_type, db_name in databases.items():
-            print(f"Creating {db_type} schemas in {db_name}.db...")
-            
-            conn = get_duckdb_connection(db_name)
-            
-            try:
-                if db_type == "hierarchy":
-                    self.create_hierarchy_schemas(conn)
-                elif db_type == "metrics":
-                    self.create_metrics_schemas(conn)
-                elif db_type == "logs":
-                    self.create_logging_schemas(conn)
-                elif db_type == "rag":
-                    self.create_rag_schemas(conn)
-                elif db_type == "system":
-                    self.create_system_schemas(conn)
-                
-                # Record schema version (only for system database)
-                if db_type == "system":
-                    conn.execute("""
-                        INSERT INTO schema_versions 
-                        (schema_name, version, applied_at) 
-                        VALUES (?, '1.0.0', CURRENT_TIMESTAMP)
-                        ON CONFLICT (schema_name, version) DO NOTHING
-                    """, [db_type])
-                
-                print(f"✓ {db_type} schemas created successfully")
-                
-            finally:
-                conn.close()
+        # Databases are independent files, so initialize them concurrently
+        with ThreadPoolExecutor(max_workers=len(databases)) as executor:
+            all_messages = list(executor.map(self._init_one, databases.items()))
+        
+        for messages in all_messages:
+            for message in messages:
+                print(message)
         
         print("All schemas initialized successfully!")
     
@@ -250,9 +357,14 @@ class SchemaManager:
             conn = get_duckdb_connection(db_name)
             
             try:
-                # Get table list
-                tables = conn.execute("SHOW TABLES").fetchall()
-                table_names = [table[0] for table in tables]
+                # Get table list (columnar fetch instead of per-row tuples)
+                tables = conn.execute("""
+                    SELECT table_name FROM duckdb_tables()
+                    WHERE database_name = current_database()
+                      AND schema_name = current_schema()
+                    ORDER BY table_name
+                """).fetchnumpy()
+                table_names = tables["table_name"].tolist()
                 
                 results[db_name] = {
                     "status": "OK",
@@ -279,6 +391,7 @@ if __name__ == "__main__":
     # Verify schemas
     print("\nVerifying schemas...")
     results = schema_manager.verify_schemas()
+    close_duckdb_connections()
     
     for db_name, result in results.items():
         print(f"\n{db_name}:")
@@ -5,27 +5,52 @@ LanceDB Configuration (stub with graceful fallback)
 Provides helpers for LanceDB setup when the package is available.
 """
 
+import functools
 from pathlib import Path
 from typing import Optional
 
 
 LANCEDB_DIR = Path("services/storage/data/lancedb")
 
+# lancedb module, imported on first use
+_lancedb = None
+
+# Set once LANCEDB_DIR has been created, so later calls skip the mkdir syscalls
+_dir_ready = False
+
 
 def ensure_lancedb_dir() -> None:
+    global _dir_ready
+    if _dir_ready:
+        return
     LANCEDB_DIR.mkdir(parents=True, exist_ok=True)
+    _dir_ready = True
 
 
-def get_db(path: Optional[str] = None):
-    """Return a LanceDB connection if lancedb is installed, else raise informative error."""
-    try:
-        import lancedb
-    except Exception as e:
-        raise RuntimeError("LanceDB is not installed. Please `pip install lancedb`. ") from e
+def _load_lancedb():
+    """Import lancedb once, raising an informative error if it is missing."""
+    global _lancedb
+    if _lancedb is None:
+        try:
+            import lancedb
+        except Exception as e:
+            raise RuntimeError("LanceDB is not installed. Please `pip install lancedb`. ") from e
+        _lancedb = lancedb
+    return _lancedb
 
+
+@functools.lru_cache(maxsize=4)
+def _connect(db_path: str):
+    """Open (once per absolute path) a LanceDB connection."""
+    lancedb = _load_lancedb()
     ensure_lancedb_dir()
+    return lancedb.connect(db_path)
+
+
+def get_db(path: Optional[str] = None):
+    """Return a LanceDB connection if lancedb is installed, else raise informative error."""
     db_path = Path(path) if path else LANCEDB_DIR
-    return lancedb.connect(str(db_path))
+    return _connect(str(db_path.absolute()))
 
 
 if __name__ == "__main__":
@@ -34,4 +59,3 @@ if __name__ == "__main__":
         print("LanceDB connected:", db)
     except Exception as e:
         print("LanceDB unavailable:", e)
-
@@ -12,9 +12,13 @@ import time
 import subprocess
 import os
 import signal
+import socket
 import psutil
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from typing import Dict, Any, List, Optional, Tuple
 import json
+from neo4j import Session
 
 from neo4j_config import get_neo4j_config
 from neo4j_client import get_neo4j_client
@@ -24,6 +28,30 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
+# Schema statements applied by create_database_constraints
+_CONSTRAINTS: Tuple[str, ...] = (
+    # Node constraints
+    "CREATE CONSTRAINT entity_id_unique IF NOT EXISTS FOR (n:Entity) REQUIRE n.id IS UNIQUE",
+    "CREATE CONSTRAINT concept_id_unique IF NOT EXISTS FOR (n:Concept) REQUIRE n.id IS UNIQUE", 
+    "CREATE CONSTRAINT document_id_unique IF NOT EXISTS FOR (n:Document) REQUIRE n.id IS UNIQUE",
+    "CREATE CONSTRAINT user_id_unique IF NOT EXISTS FOR (n:User) REQUIRE n.id IS UNIQUE",
+
+    # Property constraints  
+    "CREATE CONSTRAINT entity_name_exists IF NOT EXISTS FOR (n:Entity) REQUIRE n.name IS NOT NULL",
+    "CREATE CONSTRAINT concept_name_exists IF NOT EXISTS FOR (n:Concept) REQUIRE n.name IS NOT NULL",
+
+    # Index constraints for performance
+    "CREATE INDEX entity_type_index IF NOT EXISTS FOR (n:Entity) ON (n.type)",
+    "CREATE INDEX concept_category_index IF NOT EXISTS FOR (n:Concept) ON (n.category)",
+    "CREATE INDEX document_timestamp_index IF NOT EXISTS FOR (n:Document) ON (n.created_at)",
+    "CREATE INDEX relationship_strength_index IF NOT EXISTS FOR ()-[r:RELATED]->() ON (r.strength)"
+)
+
+
+# Encoder for the initialization report, built once
+_REPORT_ENCODER = json.JSONEncoder(indent=2, default=str)
+
+
 class Neo4jDatabaseInitializer:
     """Initialize and configure Neo4j graph database."""
     
@@ -33,6 +61,14 @@ class Neo4jDatabaseInitializer:
         self.neo4j_home = "/Users/server/Code/AI-projects/AI-server/services/storage/neo4j/neo4j-community-5.23.0"
         self.neo4j_process = None
         
+        # Written by set-initial-password (server.directories.data in neo4j.conf)
+        self.auth_file = os.path.join(os.path.dirname(self.neo4j_home), "data", "dbms", "auth.ini")
+        
+        # Java environment for the neo4j / neo4j-admin scripts
+        self._java_env = os.environ.copy()
+        self._java_env["JAVA_HOME"] = "/opt/homebrew/opt/openjdk@21"
+        self._java_env["PATH"] = f"/opt/homebrew/opt/openjdk@21/bin:{self._java_env.get('PATH', '')}"
+        
     def start_neo4j_server(self) -> bool:
         """Start Neo4j server if not already running."""
         logger.info("Starting Neo4j server...")
@@ -43,20 +79,14 @@ class Neo4jDatabaseInitializer:
                 logger.info("Neo4j server is already running")
                 return True
             
-            # Set Java environment
-            env = os.environ.copy()
-            env["JAVA_HOME"] = "/opt/homebrew/opt/openjdk@21"
-            env["PATH"] = f"/opt/homebrew/opt/openjdk@21/bin:{env.get('PATH', '')}"
-            
             # Start Neo4j server
-            start_command = f"{self.neo4j_home}/bin/neo4j start"
+            start_command = [f"{self.neo4j_home}/bin/neo4j", "start"]
             
             result = subprocess.run(
                 start_command,
-                shell=True,
                 capture_output=True,
                 text=True,
-                env=env
+                env=self._java_env
             )
             
             if result.returncode == 0:
@@ -79,15 +109,25 @@ class Neo4jDatabaseInitializer:
     
     def _is_neo4j_running(self) -> bool:
         """Check if Neo4j server is running."""
+        # Neo4j records its PID on start; checking it avoids walking the process table
+        pid_file = f"{self.neo4j_home}/run/neo4j.pid"
+        if os.path.exists(pid_file):
+            try:
+                with open(pid_file) as f:
+                    pid = int(f.read().strip())
+                return 'java' in psutil.Process(pid).name().lower()
+            except (ValueError, OSError, psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+                return False
+        
         try:
-            for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
-                try:
-                    if 'java' in proc.info['name'].lower():
-                        cmdline = ' '.join(proc.info['cmdline'])
-                        if 'neo4j' in cmdline.lower():
-                            return True
-                except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
+            for proc in psutil.process_iter(attrs=('name', 'cmdline')):
+                info = proc.info
+                name = info['name']
+                if not name or 'java' not in name.lower():
                     continue
+                cmdline = info['cmdline']
+                if cmdline and any('neo4j' in arg.lower() for arg in cmdline):
+                    return True
             return False
         except Exception:
             return False
@@ -97,7 +137,16 @@ class Neo4jDatabaseInitializer:
         logger.info("Waiting for Neo4j server to be ready...")
         
         start_time = time.time()
+        delay = 0.25
         while time.time() - start_time < timeout:
+            # Cheap TCP probe first; only attempt a Bolt handshake once the port is open
+            try:
+                socket.create_connection((self.config.host, self.config.port), timeout=0.5).close()
+            except OSError:
+                time.sleep(delay)
+                delay = min(delay * 2, 2.0)
+                continue
+            
             try:
                 if self.client.connect():
                     # Test basic connectivity
@@ -109,7 +158,8 @@ class Neo4jDatabaseInitializer:
             except Exception as e:
                 logger.debug(f"Server not ready yet: {e}")
                 
-            time.sleep(2)
+            time.sleep(delay)
+            delay = min(delay * 2, 2.0)
         
         logger.error(f"Neo4j server not ready after {timeout} seconds")
         return False
@@ -119,19 +169,13 @@ class Neo4jDatabaseInitializer:
         logger.info("Stopping Neo4j server...")
         
         try:
-            # Set Java environment
-            env = os.environ.copy()
-            env["JAVA_HOME"] = "/opt/homebrew/opt/openjdk@21"
-            env["PATH"] = f"/opt/homebrew/opt/openjdk@21/bin:{env.get('PATH', '')}"
-            
-            stop_command = f"{self.neo4j_home}/bin/neo4j stop"
+            stop_command = [f"{self.neo4j_home}/bin/neo4j", "stop"]
             
             result = subprocess.run(
                 stop_command,
-                shell=True,
                 capture_output=True,
                 text=True,
-                env=env
+                env=self._java_env
             )
             
             if result.returncode == 0:
@@ -149,21 +193,22 @@ class Neo4jDatabaseInitializer:
         """Set initial Neo4j password."""
         logger.info("Setting initial Neo4j password...")
         
+        # Skip launching neo4j-admin (a full JVM) when the password is already on disk
+        if os.path.exists(self.auth_file) and os.path.getsize(self.auth_file) > 0:
+            logger.info("Initial password already set (auth file present)")
+            return True
+        
         try:
-            # Set Java environment
-            env = os.environ.copy()
-            env["JAVA_HOME"] = "/opt/homebrew/opt/openjdk@21"
-            env["PATH"] = f"/opt/homebrew/opt/openjdk@21/bin:{env.get('PATH', '')}"
-            
             # Set password using neo4j-admin
-            password_command = f"{self.neo4j_home}/bin/neo4j-admin dbms set-initial-password {self.config.password}"
+            password_command = [
+                f"{self.neo4j_home}/bin/neo4j-admin", "dbms", "set-initial-password", self.config.password
+            ]
             
             result = subprocess.run(
                 password_command,
-                shell=True,
                 capture_output=True,
                 text=True,
-                env=env
+                env=self._java_env
             )
             
             if result.returncode == 0:
@@ -182,131 +227,104 @@ class Neo4jDatabaseInitializer:
             logger.error(f"Exception setting initial password: {e}")
             return False
     
-    def create_database_constraints(self) -> bool:
+    def _session_scope(self, session: Optional[Session] = None):
+        """Use the caller's session when given, otherwise open a new one."""
+        return nullcontext(session) if session is not None else self.client.session()
+    
+    def create_database_constraints(self, session: Optional[Session] = None) -> bool:
         """Create database constraints and schema."""
         logger.info("Creating database constraints...")
         
         try:
-            constraints = [
-                # Node constraints
-                "CREATE CONSTRAINT entity_id_unique IF NOT EXISTS FOR (n:Entity) REQUIRE n.id IS UNIQUE",
-                "CREATE CONSTRAINT concept_id_unique IF NOT EXISTS FOR (n:Concept) REQUIRE n.id IS UNIQUE", 
-                "CREATE CONSTRAINT document_id_unique IF NOT EXISTS FOR (n:Document) REQUIRE n.id IS UNIQUE",
-                "CREATE CONSTRAINT user_id_unique IF NOT EXISTS FOR (n:User) REQUIRE n.id IS UNIQUE",
-                
-                # Property constraints  
-                "CREATE CONSTRAINT entity_name_exists IF NOT EXISTS FOR (n:Entity) REQUIRE n.name IS NOT NULL",
-                "CREATE CONSTRAINT concept_name_exists IF NOT EXISTS FOR (n:Concept) REQUIRE n.name IS NOT NULL",
-                
-                # Index constraints for performance
-                "CREATE INDEX entity_type_index IF NOT EXISTS FOR (n:Entity) ON (n.type)",
-                "CREATE INDEX concept_category_index IF NOT EXISTS FOR (n:Concept) ON (n.category)",
-                "CREATE INDEX document_timestamp_index IF NOT EXISTS FOR (n:Document) ON (n.created_at)",
-                "CREATE INDEX relationship_strength_index IF NOT EXISTS FOR ()-[r:RELATED]->() ON (r.strength)"
-            ]
+            def _apply_all(tx) -> int:
+                for constraint in _CONSTRAINTS:
+                    tx.run(constraint).consume()
+                return len(_CONSTRAINTS)
             
-            constraints_created = 0
-            for constraint in constraints:
+            # All schema statements in one transaction; a failing statement
+            # aborts it, so fall back to applying them one by one
+            with self._session_scope(session) as session:
                 try:
-                    result = self.client.execute_write_query(constraint)
-                    constraints_created += 1
-                    logger.debug(f"Created constraint: {constraint[:50]}...")
+                    constraints_created = session.execute_write(_apply_all)
                 except Exception as e:
-                    logger.warning(f"Constraint creation failed (may already exist): {e}")
+                    logger.warning(f"Batched constraint creation failed, retrying individually: {e}")
+                    constraints_created = 0
+                    for constraint in _CONSTRAINTS:
+                        try:
+                            session.execute_write(lambda tx: tx.run(constraint).consume())
+                            constraints_created += 1
+                            logger.debug(f"Created constraint: {constraint[:50]}...")
+                        except Exception as e:
+                            logger.warning(f"Constraint creation failed (may already exist): {e}")
             
-            logger.info(f"Database constraints processed: {constraints_created}/{len(constraints)}")
+            logger.info(f"Database constraints processed: {constraints_created}/{len(_CONSTRAINTS)}")
             return True
             
         except Exception as e:
             logger.error(f"Failed to create database constraints: {e}")
             return False
     
-    def create_seed_data(self) -> bool:
+    def create_seed_data(self, session: Optional[Session] = None) -> bool:
         """Create initial seed data for AI server operations."""
         logger.info("Creating seed data...")
         
+        # One timestamp so nodes and the edges between them agree
+        ts = time.time()
+        
         try:
-            # System entities
-            system_nodes = [
-                {
-                    "labels": ["System", "Entity"],
-                    "properties": {
-                        "id": "ai-server-system",
-                        "name": "AI Server System",
-                        "type": "system",
-                        "version": "1.0.0",
-                        "created_at": time.time(),
-                        "description": "Core AI server system entity"
-                    }
+            # System entities, keyed by the Cypher variable they bind to
+            system_nodes = {
+                "system": {
+                    "id": "ai-server-system",
+                    "name": "AI Server System",
+                    "type": "system",
+                    "version": "1.0.0",
+                    "created_at": ts,
+                    "description": "Core AI server system entity"
                 },
-                {
-                    "labels": ["Memory", "System"],  
-                    "properties": {
-                        "id": "memory-system",
-                        "name": "Memory System",
-                        "type": "memory",
-                        "capacity": "unlimited",
-                        "created_at": time.time(),
-                        "description": "AI server memory management system"
-                    }
+                "memory": {
+                    "id": "memory-system",
+                    "name": "Memory System",
+                    "type": "memory",
+                    "capacity": "unlimited",
+                    "created_at": ts,
+                    "description": "AI server memory management system"
                 },
-                {
-                    "labels": ["LLM", "System"],
-                    "properties": {
-                        "id": "llm-system", 
-                        "name": "LLM System",
-                        "type": "llm",
-                        "models": ["llama", "openai"],
-                        "created_at": time.time(),
-                        "description": "Large Language Model orchestration system"
-                    }
+                "llm": {
+                    "id": "llm-system", 
+                    "name": "LLM System",
+                    "type": "llm",
+                    "models": ["llama", "openai"],
+                    "created_at": ts,
+                    "description": "Large Language Model orchestration system"
                 }
-            ]
+            }
             
-            # Create system nodes
-            created_nodes = []
-            for node_def in system_nodes:
-                node = self.client.create_node(
-                    labels=node_def["labels"],
-                    properties=node_def["properties"]
-                )
-                created_nodes.append(node)
-                logger.debug(f"Created node: {node_def['properties']['name']}")
-            
-            # Create relationships between system components
-            if len(created_nodes) >= 2:
-                # AI Server System manages Memory System
-                self.client.execute_write_query("""
-                    MATCH (system:System {id: 'ai-server-system'})
-                    MATCH (memory:Memory {id: 'memory-system'})
-                    CREATE (system)-[r:MANAGES {
-                        relationship_type: 'system_management',
-                        created_at: $timestamp,
-                        strength: 1.0
-                    }]->(memory)
-                """, {"timestamp": time.time()})
-                
-                # AI Server System orchestrates LLM System
-                self.client.execute_write_query("""
-                    MATCH (system:System {id: 'ai-server-system'})  
-                    MATCH (llm:LLM {id: 'llm-system'})
-                    CREATE (system)-[r:ORCHESTRATES {
-                        relationship_type: 'system_orchestration',
-                        created_at: $timestamp,
-                        strength: 1.0
-                    }]->(llm)
-                """, {"timestamp": time.time()})
-                
-                # Memory System supports LLM System
-                self.client.execute_write_query("""
-                    MATCH (memory:Memory {id: 'memory-system'})
-                    MATCH (llm:LLM {id: 'llm-system'})
-                    CREATE (memory)-[r:SUPPORTS {
-                        relationship_type: 'system_support',
-                        created_at: $timestamp,
-                        strength: 0.8
-                    }]->(llm)
-                """, {"timestamp": time.time()})
+            # Create system nodes and the relationships between system
+            # components in one statement (one round trip, one transaction)
+            seed_query = """
+                CREATE (system:System:Entity $system)
+                CREATE (memory:Memory:System $memory)
+                CREATE (llm:LLM:System $llm)
+                CREATE (system)-[:MANAGES {
+                    relationship_type: 'system_management',
+                    created_at: $timestamp,
+                    strength: 1.0
+                }]->(memory)
+                CREATE (system)-[:ORCHESTRATES {
+                    relationship_type: 'system_orchestration',
+                    created_at: $timestamp,
+                    strength: 1.0
+                }]->(llm)
+                CREATE (memory)-[:SUPPORTS {
+                    relationship_type: 'system_support',
+                    created_at: $timestamp,
+                    strength: 0.8
+                }]->(llm)
+            """
+            params = {**system_nodes, "timestamp": ts}
+            with self._session_scope(session) as session:
+                session.execute_write(lambda tx: tx.run(seed_query, params).consume())
             
             logger.info(f"Seed data created: {len(system_nodes)} nodes with relationships")
             return True
@@ -330,35 +348,42 @@ class Neo4jDatabaseInitializer:
         }
         
         try:
-            # Test connectivity
-            if self.client.connect():
+            # Test connectivity (reuses the initializer's open driver)
+            if self.client.connected or self.client.connect():
                 validation_results["connectivity"] = True
                 
+                # The checks are independent: run them concurrently, each in
+                # its own session from the shared driver pool
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    constraints_future = executor.submit(self.client.execute_query, "SHOW CONSTRAINTS")
+                    indexes_future = executor.submit(self.client.execute_query, "SHOW INDEXES")
+                    stats_future = executor.submit(self.client.get_database_stats)
+                    seed_future = executor.submit(
+                        self.client.execute_query, "MATCH (:System) RETURN count(*) > 0 as ok"
+                    )
+                
                 # Count constraints
-                constraints_result = self.client.execute_query("SHOW CONSTRAINTS")
-                validation_results["constraints"] = len(constraints_result)
+                validation_results["constraints"] = len(constraints_future.result())
                 
                 # Count indexes
-                indexes_result = self.client.execute_query("SHOW INDEXES")
-                validation_results["indexes"] = len(indexes_result)
+                validation_results["indexes"] = len(indexes_future.result())
                 
                 # Count nodes and relationships
-                stats = self.client.get_database_stats()
+                stats = stats_future.result()
                 validation_results["nodes"] = stats.get("nodes", 0)
                 validation_results["relationships"] = stats.get("relationships", 0)
                 
                 # Validate seed data
-                system_nodes = self.client.find_nodes("System")
-                if len(system_nodes) >= 1:
-                    validation_results["seed_data"] = True
+                seed_result = seed_future.result()
+                validation_results["seed_data"] = bool(seed_result and seed_result[0]["ok"])
                 
                 # Performance test
-                start_time = time.time()
+                start_ns = time.perf_counter_ns()
                 test_result = self.client.execute_query("MATCH (n) RETURN count(n) as total_nodes")
-                query_time = time.time() - start_time
+                query_ms = (time.perf_counter_ns() - start_ns) / 1e6
                 
                 validation_results["performance_test"] = {
-                    "simple_query_ms": round(query_time * 1000, 2),
+                    "simple_query_ms": round(query_ms, 3),
                     "total_nodes": test_result[0]["total_nodes"] if test_result else 0
                 }
                 
@@ -385,18 +410,21 @@ class Neo4jDatabaseInitializer:
             # Step 3: Wait a bit for server to fully initialize
             time.sleep(5)
             
-            # Step 4: Connect client
-            if not self.client.connect():
+            # Step 4: Connect client (already connected if the readiness wait succeeded)
+            if not (self.client.connected or self.client.connect()):
                 logger.error("Failed to connect to Neo4j database")
                 return False
             
-            # Step 5: Create constraints and schema
-            if not self.create_database_constraints():
-                logger.warning("Some constraints may not have been created")
-            
-            # Step 6: Create seed data
-            if not self.create_seed_data():
-                logger.warning("Seed data creation may have failed")
+            # Steps 5-6 share one session (schema and data writes still need
+            # separate transactions)
+            with self.client.session() as session:
+                # Step 5: Create constraints and schema
+                if not self.create_database_constraints(session):
+                    logger.warning("Some constraints may not have been created")
+                
+                # Step 6: Create seed data
+                if not self.create_seed_data(session):
+                    logger.warning("Seed data creation may have failed")
             
             # Step 7: Validate initialization
             validation = self.validate_database_initialization()
@@ -411,10 +439,6 @@ class Neo4jDatabaseInitializer:
         except Exception as e:
             logger.error(f"Database initialization failed: {e}")
             return False
-        
-        finally:
-            # Always disconnect client
-            self.client.disconnect()
 
 
 def main():
@@ -447,8 +471,17 @@ def main():
             
             # Save initialization report
             report_path = "/Users/server/Code/AI-projects/AI-server/services/storage/data/neo4j/initialization_report.json"
-            with open(report_path, 'w') as f:
-                json.dump(validation, f, indent=2, default=str)
+            # Stream-encode into a temp file, then swap it in atomically;
+            # a partial temp file never replaces the report or stays behind
+            tmp_path = report_path + ".tmp"
+            try:
+                with open(tmp_path, 'w') as f:
+                    f.writelines(_REPORT_ENCODER.iterencode(validation))
+                os.replace(tmp_path, report_path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.unlink(tmp_path)
+                raise
             
             print(f"\n📄 Initialization report saved to: {report_path}")
             
@@ -462,6 +495,9 @@ def main():
     except Exception as e:
         print(f"❌ Initialization error: {e}")
         return False
+    finally:
+        # One driver serves every init step; close it only once we are done
+        initializer.client.disconnect()
     
     print("="*60)
     return True
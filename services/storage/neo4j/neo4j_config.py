@@ -10,7 +10,7 @@ Optimized for ARM64 macOS with memory management and performance tuning.
 import os
 import psutil
 from typing import Optional, Dict, Any
-from neo4j import GraphDatabase, Driver
+from neo4j import AsyncDriver, AsyncGraphDatabase, GraphDatabase, Driver
 import logging
 
 # Configure logging
@@ -39,6 +39,10 @@ class Neo4jConfig:
         
         self.data_dir = "/Users/server/Code/AI-projects/AI-server/services/storage/data/neo4j"
         self.driver: Optional[Driver] = None
+        
+        # Connection pool settings for the shared driver
+        self.max_connection_pool_size = 50
+        self.connection_acquisition_timeout = 60  # seconds
     
     def get_connection_uri(self) -> str:
         """Get Neo4j connection URI."""
@@ -73,11 +77,7 @@ class Neo4jConfig:
             try:
                 self.driver = GraphDatabase.driver(
                     self.get_connection_uri(),
-                    auth=(self.username, self.password),
-                    max_connection_lifetime=3600,  # 1 hour
-                    max_connection_pool_size=50,
-                    connection_acquisition_timeout=60,  # 60 seconds
-                    encrypted=False  # Local connection
+                    **self._driver_settings()
                 )
                 logger.info("Neo4j driver created successfully")
             except Exception as e:
@@ -86,6 +86,28 @@ class Neo4jConfig:
         
         return self.driver
     
+    def get_async_driver(self) -> AsyncDriver:
+        """
+        Create an async Neo4j driver with the same settings as get_driver().
+        
+        Async drivers are bound to the event loop they are used on, so each
+        call returns a new one; the caller closes it.
+        """
+        return AsyncGraphDatabase.driver(
+            self.get_connection_uri(),
+            **self._driver_settings()
+        )
+    
+    def _driver_settings(self) -> Dict[str, Any]:
+        """Auth, pool and transport settings shared by the sync and async drivers."""
+        return {
+            "auth": (self.username, self.password),
+            "max_connection_lifetime": 3600,  # 1 hour
+            "max_connection_pool_size": self.max_connection_pool_size,
+            "connection_acquisition_timeout": self.connection_acquisition_timeout,
+            "encrypted": False  # Local connection
+        }
+    
     def test_connection(self) -> bool:
         """Test Neo4j database connection."""
         try:
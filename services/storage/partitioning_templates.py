@@ -204,7 +204,7 @@ class PartitionQueryOptimizer:
 # Template schemas for common use cases
 SCHEMA_TEMPLATES = {
     "hierarchy_events": """
-        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        id UUID PRIMARY KEY,  -- uuid7() bound by the caller
         level INTEGER NOT NULL,
         parent_id UUID,
         content TEXT NOT NULL,
@@ -214,7 +214,7 @@ SCHEMA_TEMPLATES = {
     """,
     
     "system_metrics": """
-        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        id UUID PRIMARY KEY,  -- uuid7() bound by the caller
         metric_name VARCHAR(100) NOT NULL,
         metric_value DOUBLE NOT NULL,
         metric_unit VARCHAR(20),
@@ -224,7 +224,7 @@ SCHEMA_TEMPLATES = {
     """,
     
     "application_logs": """
-        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        id UUID PRIMARY KEY,  -- uuid7() bound by the caller
         level VARCHAR(20) NOT NULL,
         logger VARCHAR(100) NOT NULL,
         message TEXT NOT NULL,
@@ -236,7 +236,7 @@ SCHEMA_TEMPLATES = {
     """,
     
     "rag_events": """
-        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+        id UUID PRIMARY KEY,  -- uuid7() bound by the caller
         query_text TEXT NOT NULL,
         retrieved_docs JSON,
         response_text TEXT,
@@ -250,7 +250,7 @@ SCHEMA_TEMPLATES = {
 
 if __name__ == "__main__":
     # Test partitioning templates
-    from duckdb_config import get_duckdb_connection
+    from duckdb_config import close_duckdb_connections, get_duckdb_connection
     
     conn = get_duckdb_connection("partitioning_test")
     templates = PartitioningTemplates()
@@ -284,4 +284,5 @@ if __name__ == "__main__":
     
     print(f"\nOptimized recent data query:\n{recent_query}")
     
-    conn.close()
\ No newline at end of file
+    conn.close()
+    close_duckdb_connections()
\ No newline at end of file
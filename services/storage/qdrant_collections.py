@@ -9,7 +9,7 @@ code, documents, summaries with appropriate vector dimensions and metadata.
 from typing import Dict, List, Any, Optional
 from qdrant_client.models import Distance, VectorParams
 from qdrant_config import get_qdrant_client
-from hnsw_config import get_optimized_config_for_use_case
+from hnsw_config import HnswConfig, get_optimized_config_for_use_case
 
 
 class QdrantCollections:
@@ -87,8 +87,8 @@ class QdrantCollections:
                 print(f"✅ Collection '{collection_name}' already exists")
                 return True
             
-            # Get optimized HNSW configuration for use case
-            hnsw_config = get_optimized_config_for_use_case(use_case)
+            # Get optimized HNSW configuration for use case and vector size
+            hnsw_config = get_optimized_config_for_use_case(use_case, vector_size)
             
             # Prepare optional scalar quantization config (int8, quantile per use case)
             quant_config = None
@@ -96,14 +96,7 @@ class QdrantCollections:
                 from quantization_config import QuantizationManager
                 quantiles = QuantizationManager.get_use_case_quantiles()
                 quantile = float(quantiles.get(use_case, 0.99))
-                # Import model types lazily to avoid hard dependency during static analysis
-                from qdrant_client.models import ScalarQuantization, ScalarType
-                quant_config = ScalarQuantization(
-                    size=None,            # inferred
-                    quantile=quantile,    # per-use-case
-                    always_ram=True,      # keep quantized in RAM
-                    type=ScalarType.INT8  # 8-bit
-                )
+                quant_config = HnswConfig.get_quantization_config("sq8", quantile=quantile)
             except Exception:
                 quant_config = None
 
@@ -8,7 +8,7 @@ Comprehensive testing of DuckDB setup, connections, and query performance.
 import time
 import json
 from datetime import datetime, timedelta
-from duckdb_config import get_duckdb_connection
+from duckdb_config import close_duckdb_connections, get_duckdb_connection, uuid7
 from initial_schemas import SchemaManager
 
 
@@ -65,9 +65,9 @@ class DuckDBTester:
             
             for i in range(100):
                 conn.execute("""
-                    INSERT INTO l1_cache (level, content, metadata)
-                    VALUES (?, ?, ?)
-                """, [1, f"Test content {i}", json.dumps({"test_id": i, "timestamp": datetime.now().isoformat()})])
+                    INSERT INTO l1_cache (id, level, content, metadata)
+                    VALUES (?, ?, ?, ?)
+                """, [uuid7(), 1, f"Test content {i}", json.dumps({"test_id": i, "timestamp": datetime.now().isoformat()})])
             
             insert_time = time.time() - start_time
             
@@ -90,9 +90,9 @@ class DuckDBTester:
             
             for i in range(1000):
                 conn.execute("""
-                    INSERT INTO system_metrics (metric_name, metric_value, metric_unit, tags)
-                    VALUES (?, ?, ?, ?)
-                """, [f"test_metric_{i % 10}", float(i), "count", json.dumps({"test": True})])
+                    INSERT INTO system_metrics (id, metric_name, metric_value, metric_unit, tags)
+                    VALUES (?, ?, ?, ?, ?)
+                """, [uuid7(), f"test_metric_{i % 10}", float(i), "count", json.dumps({"test": True})])
             
             insert_time = time.time() - start_time
             
@@ -334,6 +334,7 @@ if __name__ == "__main__":
     # Run comprehensive tests
     tester = DuckDBTester()
     results = tester.run_comprehensive_tests()
+    close_duckdb_connections()
     
     # Print summary
     tester.print_test_summary(results)
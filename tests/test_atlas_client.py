@@ -0,0 +1,58 @@
+import asyncio
+
+from atlas.public.interfaces import atlas_client
+
+
+def test_session_survives_separate_event_loops():
+    async def open_session():
+        session = await atlas_client.get_session()
+        assert session is await atlas_client.get_session()
+        return session
+
+    first = asyncio.run(open_session())
+    second = asyncio.run(open_session())
+    assert first is not second
+    assert not second.is_closed
+
+
+def test_client_honours_custom_base_url_and_timeout():
+    async def enter():
+        async with atlas_client.AtlasClient(base_url="http://example:9999", timeout=5) as client:
+            session = client._session
+            assert str(session.base_url) == "http://example:9999"
+            assert session.timeout.read == 5
+            assert session is not await atlas_client.get_session()
+        assert session.is_closed
+
+        async with atlas_client.AtlasClient() as client:
+            shared = client._session
+            assert shared is await atlas_client.get_session()
+        assert not shared.is_closed
+
+    asyncio.run(enter())
+
+
+def test_process_and_enhance_accept_none_options(monkeypatch):
+    sent = []
+
+    class FakeResponse:
+        status_code = 200
+
+        def json(self):
+            return {"enhanced_content": "better"}
+
+    class FakeSession:
+        async def post(self, path, json):
+            sent.append(json)
+            return FakeResponse()
+
+    async def fake_get_session():
+        return FakeSession()
+
+    monkeypatch.setattr(atlas_client, "get_session", fake_get_session)
+
+    asyncio.run(atlas_client.atlas_process("x", options=None))
+    assert sent[-1]["options"] == {}
+
+    assert asyncio.run(atlas_client.atlas_enhance("x", parameters=None)) == "better"
+    assert sent[-1]["options"] == {"enhancement_type": "quality"}